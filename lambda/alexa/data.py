@@ -5,11 +5,13 @@ This module contains all German text strings used by the skill,
 including welcome messages, feedback, help text, and speech patterns.
 """
 
+from typing import Final
+
 # Skill metadata
 SKILL_TITLE = "Mathe-Quiz für Grundschüler"
 
 # Maximum questions per quiz session
-MAX_QUESTIONS = 10
+MAX_QUESTIONS: Final = 10
 
 # ============================================================================
 # Welcome and Launch Messages
@@ -59,7 +61,7 @@ QUESTION_NUMBER = "Aufgabe {number}: "
 # ============================================================================
 
 # German speech interjections for correct answers
-CORRECT_SPEECHCONS = [
+CORRECT_SPEECHCONS: Final = (
     "Super",
     "Prima",
     "Toll",
@@ -73,9 +75,9 @@ CORRECT_SPEECHCONS = [
     "Genau",
     "Bravo",
     "Jawohl",
-]
+)
 
-CORRECT_ANSWER_TEMPLATES = [
+CORRECT_ANSWER_TEMPLATES: Final = (
     "Super! Das ist richtig!",
     "Prima! {answer} ist die richtige Antwort!",
     "Toll gemacht! {answer} stimmt!",
@@ -83,27 +85,27 @@ CORRECT_ANSWER_TEMPLATES = [
     "Spitze! Das war richtig!",
     "Sehr gut!",
     "Klasse! {answer} ist korrekt!",
-]
+)
 
 # ============================================================================
 # Answer Feedback - Incorrect
 # ============================================================================
 
 # German speech interjections for incorrect answers
-WRONG_SPEECHCONS = [
+WRONG_SPEECHCONS: Final = (
     "Oh",
     "Hmm",
     "Schade",
     "Ups",
     "Oh nein",
-]
+)
 
-WRONG_ANSWER_TEMPLATES = [
+WRONG_ANSWER_TEMPLATES: Final = (
     "Hmm, das war leider falsch. {operand1} {operation} {operand2} ist {answer}.",
     "Schade, das stimmt nicht. Die richtige Antwort ist {answer}.",
     "Das war leider nicht richtig. {operand1} {operation} {operand2} ergibt {answer}.",
     "Nicht ganz. Die Antwort ist {answer}.",
-]
+)
 
 # ============================================================================
 # Quiz End Messages
@@ -185,6 +187,9 @@ REPROMPT_QUIZ = "Was ist die Antwort?"
 
 REPROMPT_GENERAL = "Möchtest du rechnen üben? Sag einfach 'Quiz starten'."
 
+# Pre-joined progress answer for players without any answered questions
+PROGRESS_NO_DATA_WITH_REPROMPT = PROGRESS_NO_DATA + " " + REPROMPT_GENERAL
+
 # ============================================================================
 # Exit Messages
 # ============================================================================
@@ -213,12 +218,12 @@ NOT_UNDERSTOOD_DURING_QUIZ = (
 # Operation words for German speech
 # ============================================================================
 
-OPERATION_WORDS = {
-    "add": "plus",
-    "sub": "minus",
-    "mul": "mal",
-    "div": "geteilt durch",
-}
+# Operation codes in table order. Session questions store the operation as
+# an index into these tuples.
+OPERATION_CODES: Final = ("add", "sub", "mul", "div")
+OPERATION_WORDS_BY_INDEX: Final = ("plus", "minus", "mal", "geteilt durch")
+
+OPERATION_WORDS = dict(zip(OPERATION_CODES, OPERATION_WORDS_BY_INDEX, strict=True))
 
 # German names for operations (for progress reports)
 OPERATION_NAMES = {
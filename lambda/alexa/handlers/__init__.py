@@ -1,18 +1,60 @@
-"""Alexa skill request handlers."""
-
-from alexa.handlers.launch import LaunchRequestHandler
-from alexa.handlers.progress import ProgressHandler
-from alexa.handlers.quiz import AnswerIntentHandler, QuizHandler
-from alexa.handlers.settings import SetDifficultyHandler
-from alexa.handlers.setup import SelectPlayerHandler, SetupGradeHandler
-from alexa.handlers.standard import (
-    ExitIntentHandler,
-    FallbackIntentHandler,
-    HelpIntentHandler,
-    IntentReflectorHandler,
-    RepeatHandler,
-    SessionEndedRequestHandler,
-)
+"""
+Alexa skill request handlers.
+
+Handler classes are imported lazily on first attribute access (PEP 562),
+so importing the package does not pull in every handler module and its
+dependencies up front.
+"""
+
+import importlib
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from alexa.handlers.launch import LaunchRequestHandler
+    from alexa.handlers.progress import ProgressHandler
+    from alexa.handlers.quiz import AnswerIntentHandler, QuizHandler
+    from alexa.handlers.settings import SetDifficultyHandler
+    from alexa.handlers.setup import SelectPlayerHandler, SetupGradeHandler
+    from alexa.handlers.standard import (
+        ExitIntentHandler,
+        FallbackIntentHandler,
+        HelpIntentHandler,
+        IntentReflectorHandler,
+        RepeatHandler,
+        SessionEndedRequestHandler,
+    )
+
+# Maps each exported handler to the module that defines it
+_LAZY_HANDLERS = {
+    "LaunchRequestHandler": "alexa.handlers.launch",
+    "SelectPlayerHandler": "alexa.handlers.setup",
+    "SetupGradeHandler": "alexa.handlers.setup",
+    "QuizHandler": "alexa.handlers.quiz",
+    "AnswerIntentHandler": "alexa.handlers.quiz",
+    "SetDifficultyHandler": "alexa.handlers.settings",
+    "ProgressHandler": "alexa.handlers.progress",
+    "RepeatHandler": "alexa.handlers.standard",
+    "HelpIntentHandler": "alexa.handlers.standard",
+    "ExitIntentHandler": "alexa.handlers.standard",
+    "SessionEndedRequestHandler": "alexa.handlers.standard",
+    "FallbackIntentHandler": "alexa.handlers.standard",
+    "IntentReflectorHandler": "alexa.handlers.standard",
+}
+
+
+def __getattr__(name: str):
+    """Import a handler class on first access and cache it in the package namespace."""
+    module_name = _LAZY_HANDLERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_HANDLERS])
+
 
 __all__ = [
     "LaunchRequestHandler",
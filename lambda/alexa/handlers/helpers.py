@@ -1,62 +1,247 @@
 """Helper functions for Alexa skill handlers."""
 
-import random
-from typing import TypedDict
+import string
+import time
+import zlib
+from collections.abc import Callable
+from functools import lru_cache
+from typing import TYPE_CHECKING, TypedDict, cast
+
+from ask_sdk_core.response_helper import ResponseFactory
+from ask_sdk_model import Response
 
 from alexa import data
 from alexa.math_questions import MathQuestion
-from alexa.persistence import get_persistence_manager
-from alexa.srs import SpacedRepetition
+from alexa.persistence import PersistenceManager, get_persistence_manager
+
+if TYPE_CHECKING:
+    from alexa.srs import SpacedRepetition
+
+# Request attribute holding the request's SpacedRepetition instance
+REQUEST_SRS = "srs"
 
 
 class SerializedQuestion(TypedDict):
-    """Type definition for a serialized MathQuestion stored in session."""
+    """Dict view of a MathQuestion stored in session."""
 
     question_id: str
     operand1: int
     operand2: int
-    operation: str
+    operation: int
     correct_answer: int
     question_text_german: str
 
 
-def get_srs_from_session(handler_input) -> SpacedRepetition:
+# Compact session form of a question: a JSON list without key names, ordered
+# [question_id, operand1, operand2, operation, correct_answer, question_text_german],
+# with the operation as its index (see data.OPERATION_CODES)
+SessionQuestion = list[str | int]
+
+_QUESTION_FIELDS = tuple(SerializedQuestion.__annotations__)
+_QUESTION_TEXT_INDEX = _QUESTION_FIELDS.index("question_text_german")
+# Operation code -> its index in data.OPERATION_CODES (Operation is a StrEnum,
+# so its members look up by their code)
+_OPERATION_INDEXES: dict[str, int] = {code: i for i, code in enumerate(data.OPERATION_CODES)}
+
+# Session key for quiz answers that are not yet written to DynamoDB, as
+# [question_id, correct, answered_at] entries (correct is 0 or 1, answered_at
+# in Unix seconds)
+SESSION_PENDING_ANSWERS = "pending_answers"
+
+
+def compile_template(template: str) -> Callable[..., str]:
     """
-    Get or create an SRS instance from session attributes.
+    Pre-parse a str.format template into a render function.
 
-    The SRS is stored in session for the duration of the session,
-    with question_stats loaded from persistent storage.
+    The format mini-language is parsed once here instead of on every
+    call; the literals are laid out in a parts list once, and rendering
+    only fills the field slots and joins the list. Extra keyword arguments
+    are ignored, so templates of one family can share a call signature.
     """
-    pm = get_persistence_manager(handler_input)
+    parts: list[str] = []
+    slots: list[tuple[int, str]] = []
+    for literal, field_name, format_spec, conversion in string.Formatter().parse(template):
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported format spec in template: {template!r}")
+        if literal:
+            parts.append(literal)
+        if field_name is not None:
+            slots.append((len(parts), field_name))
+            parts.append("")
+
+    def render(**fields) -> str:
+        out = parts.copy()
+        for index, name in slots:
+            out[index] = str(fields[name])
+        return "".join(out)
+
+    return render
+
+
+# Feedback templates compiled once at import. The template for a question is
+# picked from its ID, so rendered feedback can be memoized per question.
+_CORRECT_FEEDBACK = tuple(compile_template(t) for t in data.CORRECT_ANSWER_TEMPLATES)
+_INCORRECT_FEEDBACK = tuple(compile_template(t) for t in data.WRONG_ANSWER_TEMPLATES)
+_QUIZ_END_PERFECT = compile_template(data.QUIZ_END_PERFECT)
+_QUIZ_END_GREAT = compile_template(data.QUIZ_END_GREAT)
+_QUIZ_END_GOOD = compile_template(data.QUIZ_END_GOOD)
+_QUIZ_END_KEEP_PRACTICING = compile_template(data.QUIZ_END_KEEP_PRACTICING)
+_N_CORRECT = len(_CORRECT_FEEDBACK)
+_N_INCORRECT = len(_INCORRECT_FEEDBACK)
+
+
+def _score_thresholds(total: int) -> tuple[int, int]:
+    """Minimum correct answers for the "great" (80%) and "good" (50%) quiz end messages."""
+    return -(-total * 4 // 5), -(-total // 2)
+
+
+# Thresholds for a full-length quiz, computed once
+_QUIZ_END_GREAT_MIN, _QUIZ_END_GOOD_MIN = _score_thresholds(data.MAX_QUESTIONS)
+
+
+def build_static_response(speech: str, reprompt: str | None = None) -> Response:
+    """
+    Build a response whose content never changes, once at import.
+
+    Without a reprompt the response ends the session. Handlers return the
+    shared object directly, so it must not be modified afterwards.
+    """
+    factory = ResponseFactory().speak(speech)
+    if reprompt is None:
+        factory.set_should_end_session(True)
+    else:
+        factory.ask(reprompt)
+    return factory.response
+
+
+def invalidate_srs_cache(handler_input) -> None:
+    """Drop the SRS of the current request (e.g. after a grade change), so it is built again."""
+    handler_input.attributes_manager.request_attributes.pop(REQUEST_SRS, None)
+
+
+def get_srs_from_session(handler_input, pm: PersistenceManager | None = None) -> SpacedRepetition:
+    """
+    Get the SRS instance of the current request, creating it on first use.
+
+    The instance is kept in the request attributes, so e.g. flushing
+    buffered answers and the handler that runs afterwards share it. Its
+    question_stats are loaded through the PersistenceManager (whose warm
+    cache serves reads). Pass the request's PersistenceManager as ``pm``
+    to avoid creating another one.
+    """
+    request_attr = handler_input.attributes_manager.request_attributes
+    srs = cast("SpacedRepetition | None", request_attr.get(REQUEST_SRS))
+    if srs is None:
+        srs = request_attr[REQUEST_SRS] = _load_srs(handler_input, pm)
+    return srs
+
+
+def _load_srs(handler_input, pm: PersistenceManager | None) -> SpacedRepetition:
+    """Build an SRS from the current player's stored grade and question stats."""
+    # Imported here so handler modules that never touch the SRS do not
+    # load the question engine at cold start
+    from alexa.srs import SpacedRepetition
+
+    if pm is None:
+        pm = get_persistence_manager(handler_input)
     profile = pm.get_user_profile()
 
     # Create SRS instance with current question stats
-    question_stats = pm.get_question_stats()
-    srs = SpacedRepetition(question_stats=question_stats, grade=profile.grade)
+    return SpacedRepetition(question_stats=pm.get_question_stats(), grade=profile.grade)
 
-    return srs
 
+def save_srs_state(
+    handler_input, srs: SpacedRepetition, pm: PersistenceManager | None = None
+) -> None:
+    """
+    Save SRS question stats to persistent storage.
 
-def save_srs_state(handler_input, srs: SpacedRepetition) -> None:
-    """Save SRS question stats to persistent storage."""
-    pm = get_persistence_manager(handler_input)
-    pm.save_question_stats(srs.question_stats)
+    Only the stats of questions answered since the last save are written.
+    Pass the request's PersistenceManager as ``pm`` to reuse it; inside a
+    ``pm.transaction()`` block the write is deferred until the block exits.
+    """
+    if pm is None:
+        pm = get_persistence_manager(handler_input)
+    pm.update_question_stats(srs.pop_changed_stats())
     pm.commit()
 
 
-def get_correct_feedback(answer: int) -> str:
+def buffer_answer(session_attr: dict, question_id: str, correct: bool) -> None:
+    """
+    Queue a quiz answer in session instead of writing it to DynamoDB right away.
+
+    Buffered answers live in session attributes, so they survive between
+    turns but are only as durable as the session until they are flushed.
+    The answer time is kept with each answer and becomes its last_asked
+    when the answers are flushed.
+
+    The SRS only learns about buffered answers at the flush, so any
+    question selection during the quiz works from the stats as they were
+    before the quiz (questions already asked are still excluded).
+    """
+    session_attr.setdefault(SESSION_PENDING_ANSWERS, []).append(
+        [question_id, int(correct), time.time()]
+    )
+
+
+def flush_pending_answers(handler_input, pm: PersistenceManager | None = None) -> None:
+    """
+    Apply all buffered quiz answers to the SRS and session stats in one write.
+
+    The answers stay in session until the write succeeded, so a failed
+    flush is retried on a later turn.
+    """
+    session_attr = handler_input.attributes_manager.session_attributes
+    pending = session_attr.get(SESSION_PENDING_ANSWERS)
+    if not pending:
+        return
+
+    if pm is None:
+        pm = get_persistence_manager(handler_input)
+    with pm.transaction():
+        # Apply the answers to question stats read fresh from DynamoDB rather
+        # than from the warm cache, so answers given on another device are kept
+        pm.begin_change()
+        invalidate_srs_cache(handler_input)
+        srs = get_srs_from_session(handler_input, pm)
+        # Answers buffered before answer times were kept have no third element
+        for question_id, correct, *answered_at in pending:
+            srs.record_answer(question_id, bool(correct), *answered_at)
+            pm.update_session_stats(
+                questions_answered=1,
+                correct_answers=correct,
+                reset_streak=not correct,
+            )
+        pm.update_question_stats(srs.pop_changed_stats())
+    del session_attr[SESSION_PENDING_ANSWERS]
+
+
+def _template_index(question_id: str, count: int) -> int:
+    """Pick a template index from the question ID, stable across processes."""
+    return zlib.crc32(question_id.encode()) % count
+
+
+@lru_cache(maxsize=2048)
+def get_correct_feedback(question_id: str, answer: int) -> str:
     """Generate positive feedback for a correct answer."""
-    template = random.choice(data.CORRECT_ANSWER_TEMPLATES)
-    return template.format(answer=answer)
+    return _CORRECT_FEEDBACK[_template_index(question_id, _N_CORRECT)](answer=answer)
 
 
+@lru_cache(maxsize=2048)
 def get_incorrect_feedback(
-    operand1: int, operand2: int, operation: str, correct_answer: int
+    question_id: str, operand1: int, operand2: int, operation: int | str, correct_answer: int
 ) -> str:
-    """Generate feedback for an incorrect answer with the correct solution."""
-    template = random.choice(data.WRONG_ANSWER_TEMPLATES)
-    operation_word = data.OPERATION_WORDS.get(operation, operation)
-    return template.format(
+    """
+    Generate feedback for an incorrect answer with the correct solution.
+
+    ``operation`` is the operation index stored in session; the operation
+    code ("add", ...) written by older sessions is accepted as well.
+    """
+    if isinstance(operation, str):
+        operation_word = data.OPERATION_WORDS.get(operation, operation)
+    else:
+        operation_word = data.OPERATION_WORDS_BY_INDEX[operation]
+    return _INCORRECT_FEEDBACK[_template_index(question_id, _N_INCORRECT)](
         operand1=operand1,
         operand2=operand2,
         operation=operation_word,
@@ -66,23 +251,81 @@ def get_incorrect_feedback(
 
 def get_quiz_end_message(correct: int, total: int) -> str:
     """Get appropriate end-of-quiz message based on performance."""
+    if total == data.MAX_QUESTIONS:
+        great_min, good_min = _QUIZ_END_GREAT_MIN, _QUIZ_END_GOOD_MIN
+    else:
+        great_min, good_min = _score_thresholds(total)
+
     if correct == total:
-        return data.QUIZ_END_PERFECT.format(total=total)
-    elif correct >= total * 0.8:
-        return data.QUIZ_END_GREAT.format(correct=correct, total=total)
-    elif correct >= total * 0.5:
-        return data.QUIZ_END_GOOD.format(correct=correct, total=total)
+        return _QUIZ_END_PERFECT(total=total)
+    elif correct >= great_min:
+        return _QUIZ_END_GREAT(correct=correct, total=total)
+    elif correct >= good_min:
+        return _QUIZ_END_GOOD(correct=correct, total=total)
+    else:
+        return _QUIZ_END_KEEP_PRACTICING(correct=correct, total=total)
+
+
+def serialize_question(question: MathQuestion) -> SessionQuestion:
+    """Serialize a MathQuestion to its compact list form for session storage."""
+    return [
+        question.question_id,
+        question.operand1,
+        question.operand2,
+        _OPERATION_INDEXES[question.operation],
+        question.correct_answer,
+        question.question_text_german,
+    ]
+
+
+def plan_questions(session_attr: dict, srs: SpacedRepetition, count: int) -> MathQuestion:
+    """
+    Select the next ``count`` questions of a quiz at once and store them in session.
+
+    The first question becomes the current one; the rest are queued under
+    ``planned_questions`` so later turns can serve them without asking the
+    SRS again. Questions listed in ``session_questions`` are excluded.
+    """
+    session_questions = session_attr.setdefault("session_questions", [])
+    plan = srs.get_next_questions(count, exclude=set(session_questions))
+    question = plan[0]
+    session_attr["current_question"] = serialize_question(question)
+    session_attr["planned_questions"] = [serialize_question(q) for q in plan[1:]]
+    session_questions.append(question.question_id)
+    return question
+
+
+def pop_planned_question(session_attr: dict) -> SessionQuestion | None:
+    """Take the next planned question from session, or None if none is queued."""
+    planned: list[SessionQuestion] | None = session_attr.get("planned_questions")
+    if not planned:
+        return None
+    return planned.pop(0)
+
+
+def get_current_question(session_attr: dict) -> SerializedQuestion | dict:
+    """
+    Get the current question from session as a dict.
+
+    Accepts the compact list form as well as the dict form written by
+    older sessions. Returns an empty dict if no question is stored.
+    """
+    stored = session_attr.get("current_question")
+    if not stored:
+        return {}
+    if isinstance(stored, dict):
+        return stored
+    return dict(zip(_QUESTION_FIELDS, stored, strict=True))
+
+
+def get_current_question_text(session_attr: dict) -> str:
+    """Get the spoken text of the current question from session, or ''."""
+    stored = session_attr.get("current_question")
+    if not stored:
+        return ""
+    text: str
+    if isinstance(stored, dict):
+        text = stored.get("question_text_german", "")
     else:
-        return data.QUIZ_END_KEEP_PRACTICING.format(correct=correct, total=total)
-
-
-def serialize_question(question: MathQuestion) -> SerializedQuestion:
-    """Serialize a MathQuestion to a dictionary for session storage."""
-    return {
-        "question_id": question.question_id,
-        "operand1": question.operand1,
-        "operand2": question.operand2,
-        "operation": question.operation.value,
-        "correct_answer": question.correct_answer,
-        "question_text_german": question.question_text_german,
-    }
+        text = stored[_QUESTION_TEXT_INDEX]
+    return text
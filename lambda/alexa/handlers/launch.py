@@ -9,6 +9,9 @@ from alexa import data
 
 logger = logging.getLogger(__name__)
 
+# Request predicate built once instead of on every routing decision
+_IS_LAUNCH = is_request_type("LaunchRequest")
+
 
 class LaunchRequestHandler(AbstractRequestHandler):
     """
@@ -19,7 +22,7 @@ class LaunchRequestHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_request_type("LaunchRequest")(handler_input)
+        return _IS_LAUNCH(handler_input)
 
     def handle(self, handler_input):
         logger.info("In LaunchRequestHandler")
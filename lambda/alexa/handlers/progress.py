@@ -6,11 +6,20 @@ from ask_sdk_core.dispatch_components import AbstractRequestHandler
 from ask_sdk_core.utils import is_intent_name
 
 from alexa import data
-from alexa.handlers.helpers import get_srs_from_session
+from alexa.handlers.helpers import compile_template, get_srs_from_session
 from alexa.persistence import get_persistence_manager
 
 logger = logging.getLogger(__name__)
 
+# Intent predicates built once instead of on every routing decision
+_IS_PROGRESS = is_intent_name("ProgressIntent")
+
+# Speech templates compiled once at import
+_PROGRESS_REPORT = compile_template(data.PROGRESS_REPORT)
+_PROGRESS_STREAK = compile_template(data.PROGRESS_STREAK)
+_PROGRESS_STRONG_AREAS = compile_template(data.PROGRESS_STRONG_AREAS)
+_PROGRESS_WEAK_AREAS = compile_template(data.PROGRESS_WEAK_AREAS)
+
 
 class ProgressHandler(AbstractRequestHandler):
     """
@@ -21,7 +30,7 @@ class ProgressHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_intent_name("ProgressIntent")(handler_input)
+        return _IS_PROGRESS(handler_input)
 
     def handle(self, handler_input):
         logger.info("In ProgressHandler")
@@ -34,32 +43,37 @@ class ProgressHandler(AbstractRequestHandler):
         best_streak = session_stats.get("streak_best", 0)
 
         if total == 0:
-            speech = data.PROGRESS_NO_DATA
+            speech = data.PROGRESS_NO_DATA_WITH_REPROMPT
         else:
             percentage = round((correct / total) * 100) if total > 0 else 0
 
-            speech = data.PROGRESS_REPORT.format(
-                total=total,
-                correct=correct,
-                percentage=percentage,
-            )
+            parts = [
+                _PROGRESS_REPORT(
+                    total=total,
+                    correct=correct,
+                    percentage=percentage,
+                )
+            ]
 
             if best_streak > 0:
-                speech += data.PROGRESS_STREAK.format(streak=best_streak)
+                parts.append(_PROGRESS_STREAK(streak=best_streak))
 
             # Get strong/weak areas from SRS
-            srs = get_srs_from_session(handler_input)
+            srs = get_srs_from_session(handler_input, pm)
 
             strong_areas = srs.get_strong_areas()
             if strong_areas:
                 areas_text = " und ".join(strong_areas[:2])
-                speech += data.PROGRESS_STRONG_AREAS.format(areas=areas_text)
+                parts.append(_PROGRESS_STRONG_AREAS(areas=areas_text))
 
             weak_areas = srs.get_weak_areas()
             if weak_areas:
                 areas_text = " und ".join(weak_areas[:2])
-                speech += data.PROGRESS_WEAK_AREAS.format(areas=areas_text)
+                parts.append(_PROGRESS_WEAK_AREAS(areas=areas_text))
+
+            parts.append(" ")
+            parts.append(data.REPROMPT_GENERAL)
+            speech = "".join(parts)
 
-        speech += " " + data.REPROMPT_GENERAL
         handler_input.response_builder.speak(speech).ask(data.REPROMPT_GENERAL)
         return handler_input.response_builder.response
@@ -7,17 +7,30 @@ from ask_sdk_core.utils import is_intent_name
 
 from alexa import data
 from alexa.handlers.helpers import (
+    buffer_answer,
+    flush_pending_answers,
     get_correct_feedback,
+    get_current_question,
+    get_current_question_text,
     get_incorrect_feedback,
     get_quiz_end_message,
     get_srs_from_session,
-    save_srs_state,
+    plan_questions,
+    pop_planned_question,
     serialize_question,
 )
-from alexa.persistence import get_persistence_manager
 
 logger = logging.getLogger(__name__)
 
+# Intent predicates built once instead of on every routing decision
+_IS_QUIZ = is_intent_name("QuizIntent")
+_IS_START_OVER = is_intent_name("AMAZON.StartOverIntent")
+_IS_ANSWER = is_intent_name("AnswerIntent")
+_IS_SET_GRADE = is_intent_name("SetGradeIntent")
+
+# Prefix for the re-ask speech when the answer slot could not be parsed
+_NOT_UNDERSTOOD_PREFIX = data.NOT_UNDERSTOOD_DURING_QUIZ + " "
+
 
 class QuizHandler(AbstractRequestHandler):
     """
@@ -27,32 +40,27 @@ class QuizHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_intent_name("QuizIntent")(handler_input) or is_intent_name(
-            "AMAZON.StartOverIntent"
-        )(handler_input)
+        return _IS_QUIZ(handler_input) or _IS_START_OVER(handler_input)
 
     def handle(self, handler_input):
         session_attr = handler_input.attributes_manager.session_attributes
-        old_questions_asked = session_attr.get("questions_asked", 0)
-        old_state = session_attr.get("state", "NONE")
-        logger.info(
-            f"QuizHandler: STARTING NEW QUIZ - previous state={old_state}, "
-            f"previous questions_asked={old_questions_asked}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "QuizHandler: STARTING NEW QUIZ - previous state=%s, previous questions_asked=%d",
+                session_attr.get("state", "NONE"),
+                session_attr.get("questions_asked", 0),
+            )
         srs = get_srs_from_session(handler_input)
 
         # Reset SRS session tracking
         srs.reset_session()
 
-        # Get first question
-        question = srs.get_next_question()
-
-        # Initialize session state
+        # Initialize session state and plan all questions of the quiz up front
         session_attr["state"] = data.STATE_QUIZ
-        session_attr["current_question"] = serialize_question(question)
         session_attr["questions_asked"] = 1
         session_attr["correct_count"] = 0
-        session_attr["session_questions"] = [question.question_id]
+        session_attr["session_questions"] = []
+        question = plan_questions(session_attr, srs, data.MAX_QUESTIONS)
 
         speech = data.START_QUIZ_MESSAGE + question.question_text_german
         reprompt = question.question_text_german
@@ -65,8 +73,10 @@ class AnswerIntentHandler(AbstractRequestHandler):
     """
     Handler for processing numeric answers during a quiz.
 
-    Validates the answer, provides feedback, updates SRS,
-    and serves the next question or ends the quiz.
+    Validates the answer, provides feedback, buffers the answer for the
+    SRS, and serves the next question or ends the quiz. Buffered answers
+    are written to DynamoDB in one go when the quiz ends (or, via
+    FlushPendingAnswersInterceptor, on the first turn that is not an answer).
     """
 
     def can_handle(self, handler_input):
@@ -74,23 +84,22 @@ class AnswerIntentHandler(AbstractRequestHandler):
         if session_attr.get("state") != data.STATE_QUIZ:
             return False
         # Accept both AnswerIntent and SetGradeIntent (numbers 1-4 can be misrecognized)
-        return is_intent_name("AnswerIntent")(handler_input) or is_intent_name("SetGradeIntent")(
-            handler_input
-        )
+        return _IS_ANSWER(handler_input) or _IS_SET_GRADE(handler_input)
 
     def handle(self, handler_input):
         session_attr = handler_input.attributes_manager.session_attributes
+        max_questions = data.MAX_QUESTIONS
         questions_asked = session_attr.get("questions_asked", 0)
         correct_count = session_attr.get("correct_count", 0)
-        logger.info(
-            f"AnswerIntentHandler: questions_asked={questions_asked}, "
-            f"correct_count={correct_count}, MAX_QUESTIONS={data.MAX_QUESTIONS}"
+        logger.debug(
+            "AnswerIntentHandler: questions_asked=%d, correct_count=%d, MAX_QUESTIONS=%d",
+            questions_asked,
+            correct_count,
+            max_questions,
         )
 
-        current_q = session_attr.get("current_question", {})
-
         # Get the user's answer (from AnswerIntent's "number" or SetGradeIntent's "grade" slot)
-        slots = handler_input.request_envelope.request.intent.slots
+        slots = handler_input.request_envelope.request.intent.slots or {}
         answer_slot = slots.get("number") or slots.get("grade")
         user_answer = answer_slot.value if answer_slot else None
 
@@ -100,85 +109,82 @@ class AnswerIntentHandler(AbstractRequestHandler):
         except ValueError:
             user_answer_int = None
 
+        # Re-ask before any SRS or persistence work when the answer is unusable
         if user_answer_int is None:
-            speech = data.NOT_UNDERSTOOD_DURING_QUIZ
-            speech += " " + current_q.get("question_text_german", "")
-            reprompt = current_q.get("question_text_german", data.REPROMPT_QUIZ)
+            question_text = get_current_question_text(session_attr)
+            speech = _NOT_UNDERSTOOD_PREFIX + question_text
+            reprompt = question_text or data.REPROMPT_QUIZ
             handler_input.response_builder.speak(speech).ask(reprompt)
             return handler_input.response_builder.response
 
         # Check answer correctness
+        current_q = get_current_question(session_attr)
         correct_answer = current_q.get("correct_answer")
         is_correct = user_answer_int == correct_answer
 
-        # Update SRS
-        srs = get_srs_from_session(handler_input)
+        # Keep the answer in session; it is persisted with the rest of the quiz
         question_id = current_q.get("question_id")
-        srs.record_answer(question_id, is_correct)
-        save_srs_state(handler_input, srs)
-
-        # Update persistence stats
-        pm = get_persistence_manager(handler_input)
-        pm.update_session_stats(
-            questions_answered=1,
-            correct_answers=1 if is_correct else 0,
-            reset_streak=not is_correct,
-        )
-        pm.commit()
+        buffer_answer(session_attr, question_id, is_correct)
 
         # Generate feedback
         if is_correct:
-            session_attr["correct_count"] = session_attr.get("correct_count", 0) + 1
-            feedback = get_correct_feedback(correct_answer)
+            correct_count += 1
+            feedback = get_correct_feedback(question_id, correct_answer)
         else:
             operation = current_q.get("operation", "")
             feedback = get_incorrect_feedback(
+                question_id,
                 current_q.get("operand1", 0),
                 current_q.get("operand2", 0),
                 operation,
                 correct_answer,
             )
+        session_attr["correct_count"] = correct_count
 
         # Check if quiz is complete
-        questions_asked = session_attr.get("questions_asked", 0)
-        logger.info(
-            f"Quiz progress check: questions_asked={questions_asked}, "
-            f"MAX_QUESTIONS={data.MAX_QUESTIONS}, should_end={questions_asked >= data.MAX_QUESTIONS}"
-        )
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(
+                "Quiz progress check: questions_asked=%d, MAX_QUESTIONS=%d, should_end=%s",
+                questions_asked,
+                max_questions,
+                questions_asked >= max_questions,
+            )
 
-        if questions_asked >= data.MAX_QUESTIONS:
-            # Quiz complete
-            correct_count = session_attr.get("correct_count", 0)
-            logger.info(f"QUIZ COMPLETE: correct={correct_count}, total={questions_asked}")
+        if questions_asked >= max_questions:
+            # Quiz complete: write all answers of the quiz with a single write
+            logger.info("QUIZ COMPLETE: correct=%d, total=%d", correct_count, questions_asked)
+            flush_pending_answers(handler_input)
             end_message = get_quiz_end_message(correct_count, questions_asked)
 
-            speech = feedback + " " + end_message + " " + data.EXIT_SKILL_MESSAGE
+            speech = " ".join((feedback, end_message, data.EXIT_SKILL_MESSAGE))
             session_attr["state"] = data.STATE_NONE
 
             handler_input.response_builder.speak(speech).set_should_end_session(True)
         else:
-            # Get next question
-            next_question = srs.get_next_question()
-
-            # Avoid immediate repeats
+            # Serve the next planned question
             session_questions = session_attr.get("session_questions", [])
-            max_attempts = 10
-            attempts = 0
-            while next_question.question_id in session_questions and attempts < max_attempts:
-                next_question = srs.get_next_question()
-                attempts += 1
-
-            session_attr["current_question"] = serialize_question(next_question)
+            next_question = pop_planned_question(session_attr)
+            if next_question is None:
+                # Quiz started without a plan: ask the SRS, avoiding questions
+                # already asked in this quiz
+                srs = get_srs_from_session(handler_input)
+                next_question = serialize_question(
+                    srs.get_next_question(exclude=set(session_questions))
+                )
+
+            session_attr["current_question"] = next_question
             session_attr["questions_asked"] = questions_asked + 1
-            session_questions.append(next_question.question_id)
+            session_questions.append(next_question[0])
             session_attr["session_questions"] = session_questions
-            logger.info(
-                f"Next question: questions_asked now {questions_asked + 1}, "
-                f"question_id={next_question.question_id}"
+            logger.debug(
+                "Next question: questions_asked now %d, question_id=%s",
+                questions_asked + 1,
+                next_question[0],
             )
 
-            speech = feedback + " " + data.NEXT_QUESTION + next_question.question_text_german
-            reprompt = next_question.question_text_german
+            question_text = get_current_question_text(session_attr)
+            speech = f"{feedback} {data.NEXT_QUESTION}{question_text}"
+            reprompt = question_text
 
             handler_input.response_builder.speak(speech).ask(reprompt)
 
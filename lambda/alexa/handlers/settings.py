@@ -6,11 +6,29 @@ from ask_sdk_core.dispatch_components import AbstractRequestHandler
 from ask_sdk_core.utils import is_intent_name
 
 from alexa import data
-from alexa.handlers.helpers import get_srs_from_session, serialize_question
+from alexa.handlers.helpers import (
+    compile_template,
+    get_srs_from_session,
+    invalidate_srs_cache,
+    plan_questions,
+)
 from alexa.persistence import get_persistence_manager
 
 logger = logging.getLogger(__name__)
 
+# Intent predicates built once instead of on every routing decision
+_IS_SET_GRADE = is_intent_name("SetGradeIntent")
+_IS_SET_DIFFICULTY = is_intent_name("SetDifficultyIntent")
+
+# Spoken directions for changing the difficulty
+_EASIER = frozenset({"leichter", "einfacher", "leicht"})
+_HARDER = frozenset({"schwerer", "schwieriger", "schwer"})
+
+# Speech templates compiled once at import
+_DIFFICULTY_CHANGED = compile_template(data.DIFFICULTY_CHANGED)
+_DIFFICULTY_SAME_EASIEST = data.DIFFICULTY_SAME.format(direction="einfachsten")
+_DIFFICULTY_SAME_HARDEST = data.DIFFICULTY_SAME.format(direction="schwierigsten")
+
 
 class SetDifficultyHandler(AbstractRequestHandler):
     """
@@ -23,28 +41,34 @@ class SetDifficultyHandler(AbstractRequestHandler):
     def can_handle(self, handler_input):
         session_attr = handler_input.attributes_manager.session_attributes
         # Don't handle SetGradeIntent during quiz - it's likely an answer misrecognized
-        if is_intent_name("SetGradeIntent")(handler_input):
+        if _IS_SET_GRADE(handler_input):
             return session_attr.get("state") != data.STATE_QUIZ
-        return is_intent_name("SetDifficultyIntent")(handler_input)
+        return _IS_SET_DIFFICULTY(handler_input)
 
     def handle(self, handler_input):
         logger.info("In SetDifficultyHandler")
 
         session_attr = handler_input.attributes_manager.session_attributes
         pm = get_persistence_manager(handler_input)
-        profile = pm.get_user_profile()
-        current_grade = profile.grade
+
+        # The grade is kept in session once known, so a turn that does not
+        # change it never has to load the profile
+        current_grade = session_attr.get("grade")
+        if current_grade is None:
+            current_grade = pm.get_user_profile().grade
+            session_attr["grade"] = current_grade
 
         # Check for explicit grade or difficulty direction
-        slots = handler_input.request_envelope.request.intent.slots
+        slots = handler_input.request_envelope.request.intent.slots or {}
 
         # Check for grade slot
-        grade_slot = slots.get("grade", {}) if slots else {}
+        grade_slot = slots.get("grade")
         grade_value = grade_slot.value if grade_slot else None
 
         # Check for difficulty direction slot
-        direction_slot = slots.get("direction", {}) if slots else {}
+        direction_slot = slots.get("direction")
         direction_value = direction_slot.value if direction_slot else None
+        direction_lower = direction_value.lower() if direction_value else ""
 
         new_grade = current_grade
 
@@ -55,40 +79,37 @@ class SetDifficultyHandler(AbstractRequestHandler):
                     new_grade = current_grade
             except ValueError:
                 pass
-        elif direction_value:
-            direction_lower = direction_value.lower()
-            if direction_lower in ["leichter", "einfacher", "leicht"]:
+        elif direction_lower:
+            if direction_lower in _EASIER:
                 new_grade = max(1, current_grade - 1)
-            elif direction_lower in ["schwerer", "schwieriger", "schwer"]:
+            elif direction_lower in _HARDER:
                 new_grade = min(4, current_grade + 1)
 
         if new_grade != current_grade:
-            profile.grade = new_grade
-            pm.save_user_profile(profile)
+            pm.update_user_profile(grade=new_grade)
             pm.commit()
+            invalidate_srs_cache(handler_input)
+            session_attr["grade"] = new_grade
 
             grade_name = data.GRADE_NAMES.get(new_grade, str(new_grade))
-            speech = data.DIFFICULTY_CHANGED.format(grade=grade_name)
+            speech = _DIFFICULTY_CHANGED(grade=grade_name)
         else:
-            if direction_value and direction_value.lower() in ["leichter", "einfacher", "leicht"]:
-                speech = data.DIFFICULTY_SAME.format(direction="einfachsten")
-            elif direction_value and direction_value.lower() in [
-                "schwerer",
-                "schwieriger",
-                "schwer",
-            ]:
-                speech = data.DIFFICULTY_SAME.format(direction="schwierigsten")
+            if direction_lower in _EASIER:
+                speech = _DIFFICULTY_SAME_EASIEST
+            elif direction_lower in _HARDER:
+                speech = _DIFFICULTY_SAME_HARDEST
             else:
                 grade_name = data.GRADE_NAMES.get(current_grade, str(current_grade))
-                speech = data.DIFFICULTY_CHANGED.format(grade=grade_name)
+                speech = _DIFFICULTY_CHANGED(grade=grade_name)
 
         # If in quiz, continue with new difficulty
         if session_attr.get("state") == data.STATE_QUIZ:
-            srs = get_srs_from_session(handler_input)
+            srs = get_srs_from_session(handler_input, pm)
             srs.grade = new_grade
-            next_question = srs.get_next_question()
+            # Re-plan the rest of the quiz, replacing the current question
+            remaining = data.MAX_QUESTIONS - session_attr.get("questions_asked", 1) + 1
+            next_question = plan_questions(session_attr, srs, max(remaining, 1))
 
-            session_attr["current_question"] = serialize_question(next_question)
             speech += " " + data.NEXT_QUESTION + next_question.question_text_german
             reprompt = next_question.question_text_german
         else:
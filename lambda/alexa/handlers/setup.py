@@ -5,13 +5,52 @@ import logging
 
 from ask_sdk_core.dispatch_components import AbstractRequestHandler
 from ask_sdk_core.utils import is_intent_name
+from ask_sdk_model.slu.entityresolution import StatusCode
 
 from alexa import data
-from alexa.handlers.helpers import get_srs_from_session, serialize_question
+from alexa.handlers.helpers import (
+    compile_template,
+    get_srs_from_session,
+    invalidate_srs_cache,
+    plan_questions,
+)
 from alexa.persistence import get_persistence_manager
 
 logger = logging.getLogger(__name__)
 
+# Intent predicates built once instead of on every routing decision
+_IS_SET_NAME = is_intent_name("SetNameIntent")
+_IS_SET_GRADE = is_intent_name("SetGradeIntent")
+
+# Speech templates compiled once at import
+_WELCOME_MESSAGE_NEW_PLAYER = compile_template(data.WELCOME_MESSAGE_NEW_PLAYER)
+_WELCOME_MESSAGE_RETURNING = compile_template(data.WELCOME_MESSAGE_RETURNING)
+_WELCOME_MESSAGE_RETURNING_NO_STATS = compile_template(data.WELCOME_MESSAGE_RETURNING_NO_STATS)
+_ASK_GRADE = compile_template(data.ASK_GRADE)
+_CONFIRM_GRADE = compile_template(data.CONFIRM_GRADE)
+
+
+def _extract_grade(grade_slot) -> int | None:
+    """
+    Get the grade from the grade slot.
+
+    Prefers the canonical ID from entity resolution and falls back to
+    parsing the raw slot value. Returns None if neither yields a number.
+    """
+    if not grade_slot:
+        return None
+
+    resolutions = grade_slot.resolutions
+    if resolutions and resolutions.resolutions_per_authority:
+        for resolution in resolutions.resolutions_per_authority:
+            if resolution.status.code == StatusCode.ER_SUCCESS_MATCH:
+                return int(resolution.values[0].value.id)
+
+    if grade_slot.value:
+        with contextlib.suppress(ValueError):
+            return int(grade_slot.value)
+    return None
+
 
 class SelectPlayerHandler(AbstractRequestHandler):
     """
@@ -23,16 +62,14 @@ class SelectPlayerHandler(AbstractRequestHandler):
 
     def can_handle(self, handler_input):
         session_attr = handler_input.attributes_manager.session_attributes
-        return (
-            is_intent_name("SetNameIntent")(handler_input)
-            and session_attr.get("state") == data.STATE_ASK_PLAYER
-        )
+        # Cheap state check first; most requests arrive outside this setup step
+        return session_attr.get("state") == data.STATE_ASK_PLAYER and _IS_SET_NAME(handler_input)
 
     def handle(self, handler_input):
         logger.info("In SelectPlayerHandler")
 
-        slots = handler_input.request_envelope.request.intent.slots
-        name_slot = slots.get("name", {})
+        slots = handler_input.request_envelope.request.intent.slots or {}
+        name_slot = slots.get("name")
         name_value = name_slot.value if name_slot else None
 
         session_attr = handler_input.attributes_manager.session_attributes
@@ -43,35 +80,32 @@ class SelectPlayerHandler(AbstractRequestHandler):
             handler_input.response_builder.speak(speech).ask(reprompt)
             return handler_input.response_builder.response
 
-        # Set the current player
+        # Set the current player and read their record once
         pm = get_persistence_manager(handler_input)
-        pm.set_current_player(name_value)
+        player = pm.load_player(name_value)
 
         # Store in session for display (preserve original casing)
         session_attr["current_player"] = name_value.lower().strip()
         session_attr["current_player_display"] = name_value
+        session_attr.pop("grade", None)
 
         # Always ask for grade - allows choosing difficulty each session
         session_attr["state"] = data.STATE_SETUP_GRADE
 
-        if pm.is_new_player():
-            speech = data.WELCOME_MESSAGE_NEW_PLAYER.format(name=name_value)
+        if player.is_new:
+            speech = _WELCOME_MESSAGE_NEW_PLAYER(name=name_value)
         else:
             # Returning player - welcome back and ask for grade
-            session_stats = pm.get_session_stats()
-            total = session_stats.get("total_questions", 0)
-            correct = session_stats.get("total_correct", 0)
-
-            if total > 0:
-                speech = data.WELCOME_MESSAGE_RETURNING.format(
+            if player.total_questions > 0:
+                speech = _WELCOME_MESSAGE_RETURNING(
                     name=name_value,
-                    correct=correct,
-                    total=total,
+                    correct=player.total_correct,
+                    total=player.total_questions,
                 )
             else:
-                speech = data.WELCOME_MESSAGE_RETURNING_NO_STATS.format(name=name_value)
+                speech = _WELCOME_MESSAGE_RETURNING_NO_STATS(name=name_value)
 
-        reprompt = data.ASK_GRADE.format(name=name_value)
+        reprompt = _ASK_GRADE(name=name_value)
         handler_input.response_builder.speak(speech).ask(reprompt)
         return handler_input.response_builder.response
 
@@ -85,67 +119,45 @@ class SetupGradeHandler(AbstractRequestHandler):
 
     def can_handle(self, handler_input):
         session_attr = handler_input.attributes_manager.session_attributes
-        return (
-            is_intent_name("SetGradeIntent")(handler_input)
-            and session_attr.get("state") == data.STATE_SETUP_GRADE
-        )
+        # Cheap state check first; most requests arrive outside this setup step
+        return session_attr.get("state") == data.STATE_SETUP_GRADE and _IS_SET_GRADE(handler_input)
 
     def handle(self, handler_input):
         logger.info("In SetupGradeHandler")
 
-        slots = handler_input.request_envelope.request.intent.slots
-        grade_slot = slots.get("grade", {})
-
-        # Try to get the resolved value (id) from slot resolution
-        grade = None
-        if grade_slot:
-            # First try to get the canonical ID from entity resolution
-            resolutions = getattr(grade_slot, "resolutions", None)
-            if resolutions and resolutions.resolutions_per_authority:
-                for resolution in resolutions.resolutions_per_authority:
-                    if resolution.status.code.value == "ER_SUCCESS_MATCH":
-                        grade = int(resolution.values[0].value.id)
-                        break
-
-            # Fallback: try to parse the raw value as integer
-            if grade is None and grade_slot.value:
-                with contextlib.suppress(ValueError):
-                    grade = int(grade_slot.value)
+        slots = handler_input.request_envelope.request.intent.slots or {}
+        grade = _extract_grade(slots.get("grade"))
 
         session_attr = handler_input.attributes_manager.session_attributes
 
         if not (grade and 1 <= grade <= 4):
             player_name = session_attr.get("current_player_display", "")
             speech = data.INVALID_GRADE
-            reprompt = data.ASK_GRADE.format(name=player_name)
+            reprompt = _ASK_GRADE(name=player_name)
             handler_input.response_builder.speak(speech).ask(reprompt)
             return handler_input.response_builder.response
 
-        # Save grade to profile
+        # Save grade and session count to the profile with a single write
         pm = get_persistence_manager(handler_input)
-        profile = pm.get_user_profile()
-        profile.grade = grade
-        pm.save_user_profile(profile)
-        pm.increment_session_count()
-        pm.commit()
+        with pm.transaction():
+            pm.update_user_profile(grade=grade)
+            pm.increment_session_count()
+        invalidate_srs_cache(handler_input)
+        session_attr["grade"] = grade
 
         grade_name = data.GRADE_NAMES.get(grade, str(grade))
 
         # Start quiz immediately
-        srs = get_srs_from_session(handler_input)
+        srs = get_srs_from_session(handler_input, pm)
         srs.reset_session()
-        question = srs.get_next_question()
 
         session_attr["state"] = data.STATE_QUIZ
-        session_attr["current_question"] = serialize_question(question)
         session_attr["correct_count"] = 0
         session_attr["questions_asked"] = 1
+        session_attr["session_questions"] = []
+        question = plan_questions(session_attr, srs, data.MAX_QUESTIONS)
 
-        speech = (
-            data.CONFIRM_GRADE.format(grade=grade_name)
-            + " Los geht's! "
-            + question.question_text_german
-        )
+        speech = _CONFIRM_GRADE(grade=grade_name) + " Los geht's! " + question.question_text_german
         reprompt = question.question_text_german
 
         handler_input.response_builder.speak(speech).ask(reprompt)
@@ -1,17 +1,39 @@
 """Standard Alexa intent handlers (Help, Exit, Repeat, Fallback, etc.)."""
 
-import json
 import logging
 
 from ask_sdk_core.dispatch_components import AbstractRequestHandler
-from ask_sdk_core.serialize import DefaultSerializer
 from ask_sdk_core.utils import is_intent_name, is_request_type
-from ask_sdk_model import Response
 
 from alexa import data
+from alexa.handlers.helpers import (
+    build_static_response,
+    compile_template,
+    get_current_question_text,
+)
 
 logger = logging.getLogger(__name__)
 
+# Request predicates built once instead of on every routing decision
+_IS_REPEAT = is_intent_name("AMAZON.RepeatIntent")
+_IS_HELP = is_intent_name("AMAZON.HelpIntent")
+_IS_EXIT = (
+    is_intent_name("AMAZON.CancelIntent"),
+    is_intent_name("AMAZON.StopIntent"),
+    is_intent_name("AMAZON.PauseIntent"),
+)
+_IS_SESSION_ENDED = is_request_type("SessionEndedRequest")
+_IS_FALLBACK = is_intent_name("AMAZON.FallbackIntent")
+_IS_INTENT_REQUEST = is_request_type("IntentRequest")
+
+# Speech templates compiled once at import
+_REPEAT_QUESTION = compile_template(data.REPEAT_QUESTION)
+_EXIT_DURING_QUIZ = compile_template(data.EXIT_DURING_QUIZ)
+
+# Constant responses outside a quiz, built once at import
+_EXIT_RESPONSE = build_static_response(data.EXIT_SKILL_MESSAGE)
+_FALLBACK_RESPONSE = build_static_response(data.FALLBACK_MESSAGE, data.REPROMPT_GENERAL)
+
 
 class RepeatHandler(AbstractRequestHandler):
     """
@@ -22,7 +44,7 @@ class RepeatHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_intent_name("AMAZON.RepeatIntent")(handler_input)
+        return _IS_REPEAT(handler_input)
 
     def handle(self, handler_input):
         logger.info("In RepeatHandler")
@@ -30,24 +52,25 @@ class RepeatHandler(AbstractRequestHandler):
         session_attr = handler_input.attributes_manager.session_attributes
 
         if session_attr.get("state") == data.STATE_QUIZ:
-            current_q = session_attr.get("current_question", {})
-            question_text = current_q.get("question_text_german", "")
+            question_text = get_current_question_text(session_attr)
 
             if question_text:
-                speech = data.REPEAT_QUESTION.format(question=question_text)
+                speech = _REPEAT_QUESTION(question=question_text)
                 reprompt = question_text
             else:
                 speech = data.ERROR_MESSAGE
                 reprompt = data.REPROMPT_GENERAL
         else:
-            # Outside quiz, try to use cached response
-            if "recent_response" in session_attr:
-                cached_response_str = json.dumps(session_attr["recent_response"])
-                cached_response = DefaultSerializer().deserialize(cached_response_str, Response)
-                return cached_response
-            else:
-                speech = data.HELP_MESSAGE
-                reprompt = data.REPROMPT_GENERAL
+            # Outside quiz, replay the speech of the cached response
+            cached = session_attr.get("recent_response")
+            if cached and cached.get("speech"):
+                handler_input.response_builder.speak(cached["speech"])
+                if cached.get("reprompt"):
+                    handler_input.response_builder.ask(cached["reprompt"])
+                return handler_input.response_builder.response
+
+            speech = data.HELP_MESSAGE
+            reprompt = data.REPROMPT_GENERAL
 
         handler_input.response_builder.speak(speech).ask(reprompt)
         return handler_input.response_builder.response
@@ -61,7 +84,7 @@ class HelpIntentHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_intent_name("AMAZON.HelpIntent")(handler_input)
+        return _IS_HELP(handler_input)
 
     def handle(self, handler_input):
         logger.info("In HelpIntentHandler")
@@ -71,8 +94,7 @@ class HelpIntentHandler(AbstractRequestHandler):
         if session_attr.get("state") == data.STATE_QUIZ:
             speech = data.HELP_DURING_QUIZ
             # Repeat current question after help
-            current_q = session_attr.get("current_question", {})
-            question_text = current_q.get("question_text_german", "")
+            question_text = get_current_question_text(session_attr)
             if question_text:
                 speech += " " + question_text
             reprompt = question_text if question_text else data.REPROMPT_QUIZ
@@ -92,11 +114,7 @@ class ExitIntentHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return (
-            is_intent_name("AMAZON.CancelIntent")(handler_input)
-            or is_intent_name("AMAZON.StopIntent")(handler_input)
-            or is_intent_name("AMAZON.PauseIntent")(handler_input)
-        )
+        return any(is_exit(handler_input) for is_exit in _IS_EXIT)
 
     def handle(self, handler_input):
         logger.info("In ExitIntentHandler")
@@ -107,9 +125,9 @@ class ExitIntentHandler(AbstractRequestHandler):
             # Quiz in progress - provide summary
             correct = session_attr.get("correct_count", 0)
             answered = session_attr.get("questions_asked", 0)
-            speech = data.EXIT_DURING_QUIZ.format(correct=correct, answered=answered)
+            speech = _EXIT_DURING_QUIZ(correct=correct, answered=answered)
         else:
-            speech = data.EXIT_SKILL_MESSAGE
+            return _EXIT_RESPONSE
 
         handler_input.response_builder.speak(speech).set_should_end_session(True)
         return handler_input.response_builder.response
@@ -119,11 +137,11 @@ class SessionEndedRequestHandler(AbstractRequestHandler):
     """Handler for session end."""
 
     def can_handle(self, handler_input):
-        return is_request_type("SessionEndedRequest")(handler_input)
+        return _IS_SESSION_ENDED(handler_input)
 
     def handle(self, handler_input):
         logger.info("In SessionEndedRequestHandler")
-        logger.info(f"Session ended with reason: {handler_input.request_envelope}")
+        logger.info("Session ended with reason: %s", handler_input.request_envelope.request.reason)
         return handler_input.response_builder.response
 
 
@@ -135,7 +153,7 @@ class FallbackIntentHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_intent_name("AMAZON.FallbackIntent")(handler_input)
+        return _IS_FALLBACK(handler_input)
 
     def handle(self, handler_input):
         logger.info("In FallbackIntentHandler")
@@ -143,13 +161,11 @@ class FallbackIntentHandler(AbstractRequestHandler):
         session_attr = handler_input.attributes_manager.session_attributes
 
         if session_attr.get("state") == data.STATE_QUIZ:
-            current_q = session_attr.get("current_question", {})
-            question_text = current_q.get("question_text_german", "")
+            question_text = get_current_question_text(session_attr)
             speech = data.FALLBACK_MESSAGE + " " + question_text
             reprompt = question_text if question_text else data.REPROMPT_QUIZ
         else:
-            speech = data.FALLBACK_MESSAGE
-            reprompt = data.REPROMPT_GENERAL
+            return _FALLBACK_RESPONSE
 
         handler_input.response_builder.speak(speech).ask(reprompt)
         return handler_input.response_builder.response
@@ -165,23 +181,21 @@ class IntentReflectorHandler(AbstractRequestHandler):
     """
 
     def can_handle(self, handler_input):
-        return is_request_type("IntentRequest")(handler_input)
+        return _IS_INTENT_REQUEST(handler_input)
 
     def handle(self, handler_input):
         intent_name = handler_input.request_envelope.request.intent.name
-        logger.warning(f"IntentReflectorHandler caught unhandled intent: {intent_name}")
-        logger.info(f"Request envelope: {handler_input.request_envelope}")
+        logger.warning("IntentReflectorHandler caught unhandled intent: %s", intent_name)
+        logger.debug("Request envelope: %s", handler_input.request_envelope)
 
         session_attr = handler_input.attributes_manager.session_attributes
 
         if session_attr.get("state") == data.STATE_QUIZ:
-            current_q = session_attr.get("current_question", {})
-            question_text = current_q.get("question_text_german", "")
+            question_text = get_current_question_text(session_attr)
             speech = data.FALLBACK_MESSAGE + " " + question_text
             reprompt = question_text if question_text else data.REPROMPT_QUIZ
         else:
-            speech = data.FALLBACK_MESSAGE
-            reprompt = data.REPROMPT_GENERAL
+            return _FALLBACK_RESPONSE
 
         handler_input.response_builder.speak(speech).ask(reprompt)
         return handler_input.response_builder.response
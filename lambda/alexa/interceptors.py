@@ -9,35 +9,78 @@ from ask_sdk_core.dispatch_components import (
 )
 
 from alexa import data
+from alexa.handlers.helpers import (
+    SESSION_PENDING_ANSWERS,
+    build_static_response,
+    flush_pending_answers,
+)
+from alexa.handlers.quiz import AnswerIntentHandler
 
 logger = logging.getLogger(__name__)
 
+_ERROR_RESPONSE = build_static_response(data.ERROR_MESSAGE, data.ERROR_MESSAGE)
+
+
+def _speech_text(output_speech) -> str | None:
+    """Get the SSML or plain text of an OutputSpeech model, if any."""
+    if output_speech is None:
+        return None
+    return getattr(output_speech, "ssml", None) or getattr(output_speech, "text", None)
+
 
 class CacheResponseForRepeatInterceptor(AbstractResponseInterceptor):
     """
     Cache the response for repeat functionality.
 
-    Stores the response in session attributes so it can be
-    repeated if the user asks.
+    Stores only the speech and reprompt text of the response in session
+    attributes, so it can be repeated if the user asks without echoing the
+    whole response back and forth on every turn. Responses that end the
+    session are skipped, since no repeat request can follow them.
     """
 
     def process(self, handler_input, response):
+        if response.should_end_session:
+            return
+        speech = _speech_text(response.output_speech)
+        if not speech:
+            return
+        reprompt = _speech_text(response.reprompt.output_speech) if response.reprompt else None
         session_attr = handler_input.attributes_manager.session_attributes
-        session_attr["recent_response"] = response
+        session_attr["recent_response"] = {"speech": speech, "reprompt": reprompt}
+
+
+class FlushPendingAnswersInterceptor(AbstractRequestInterceptor):
+    """
+    Write buffered quiz answers before any request that is not an answer.
+
+    Covers stopping, leaving the skill, session timeouts (SessionEndedRequest)
+    and other intents mid-quiz, so handlers reading progress or switching
+    players always see the answers given so far.
+    """
+
+    _answer_handler = AnswerIntentHandler()
+
+    def process(self, handler_input):
+        session_attr = handler_input.attributes_manager.session_attributes
+        if not session_attr.get(SESSION_PENDING_ANSWERS):
+            return
+        if self._answer_handler.can_handle(handler_input):
+            return
+        flush_pending_answers(handler_input)
 
 
 class RequestLogger(AbstractRequestInterceptor):
-    """Log incoming requests."""
+    """Log incoming requests (at DEBUG level; the envelope repr is large)."""
 
     def process(self, handler_input):
-        logger.info(f"Request Envelope: {handler_input.request_envelope}")
+        logger.debug("Request Envelope: %s", handler_input.request_envelope)
 
 
 class ResponseLogger(AbstractResponseInterceptor):
-    """Log outgoing responses."""
+    """Log outgoing responses (at DEBUG level)."""
 
     def process(self, handler_input, response):
-        logger.info(f"Response: {response}")
+        logger.debug("Response: %s", response)
 
 
 class CatchAllExceptionHandler(AbstractExceptionHandler):
@@ -52,8 +95,4 @@ class CatchAllExceptionHandler(AbstractExceptionHandler):
 
     def handle(self, handler_input, exception):
         logger.error(exception, exc_info=True)
-
-        speech = data.ERROR_MESSAGE
-        handler_input.response_builder.speak(speech).ask(speech)
-
-        return handler_input.response_builder.response
+        return _ERROR_RESPONSE
@@ -5,14 +5,22 @@ This module generates dynamic math questions for different grade levels,
 with support for addition, subtraction, multiplication, and division.
 """
 
+import itertools
 import random
-from collections.abc import Callable
+import sys
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
-from enum import Enum
+from enum import StrEnum
+from functools import cache, lru_cache
 
 
-class Operation(Enum):
-    """Supported math operations."""
+class Operation(StrEnum):
+    """
+    Supported math operations.
+
+    A StrEnum hashes like its string value, which keeps the many
+    operation-keyed dict lookups on the fast str hash path.
+    """
 
     ADDITION = "add"
     SUBTRACTION = "sub"
@@ -25,9 +33,9 @@ class DifficultyConfig:
     """Configuration for a specific grade level."""
 
     grade: int
-    operations: list[Operation]
+    operations: tuple[Operation, ...]
     number_range: tuple[int, int]  # (min, max) - default range
-    multiplication_tables: list[int] | None = None  # For grades that learn specific tables
+    multiplication_tables: tuple[int, ...] | None = None  # For grades that learn specific tables
     operation_ranges: dict[Operation, tuple[int, int]] | None = None  # Per-operation overrides
 
 
@@ -35,12 +43,12 @@ class DifficultyConfig:
 GRADE_CONFIGS: dict[int, DifficultyConfig] = {
     1: DifficultyConfig(
         grade=1,
-        operations=[Operation.ADDITION],
+        operations=(Operation.ADDITION,),
         number_range=(1, 10),
     ),
     2: DifficultyConfig(
         grade=2,
-        operations=[Operation.ADDITION, Operation.SUBTRACTION],
+        operations=(Operation.ADDITION, Operation.SUBTRACTION),
         number_range=(1, 20),  # Default range
         operation_ranges={
             Operation.ADDITION: (1, 20),
@@ -49,30 +57,30 @@ GRADE_CONFIGS: dict[int, DifficultyConfig] = {
     ),
     3: DifficultyConfig(
         grade=3,
-        operations=[
+        operations=(
             Operation.ADDITION,
             Operation.SUBTRACTION,
             Operation.MULTIPLICATION,
             Operation.DIVISION,
-        ],
+        ),
         number_range=(0, 100),
-        multiplication_tables=list(range(1, 11)),  # Full times tables 1-10
+        multiplication_tables=tuple(range(1, 11)),  # Full times tables 1-10
     ),
     4: DifficultyConfig(
         grade=4,
-        operations=[
+        operations=(
             Operation.ADDITION,
             Operation.SUBTRACTION,
             Operation.MULTIPLICATION,
             Operation.DIVISION,
-        ],
+        ),
         number_range=(0, 1000),
-        multiplication_tables=list(range(1, 13)),  # Extended tables 1-12
+        multiplication_tables=tuple(range(1, 13)),  # Extended tables 1-12
     ),
 }
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class MathQuestion:
     """Represents a single math question."""
 
@@ -108,8 +116,23 @@ def _number_to_german_speech(num: int) -> str:
 
 
 def generate_question_id(operation: Operation, operand1: int, operand2: int) -> str:
-    """Generate a unique question ID for SRS tracking."""
-    return f"{operation.value}_{operand1}_{operand2}"
+    """
+    Generate a unique question ID for SRS tracking.
+
+    IDs are interned, so the IDs of generated questions and of loaded stats
+    share one string object and dict lookups between them compare by identity.
+    """
+    return sys.intern(f"{operation.value}_{operand1}_{operand2}")
+
+
+def _randint(low: int, high: int) -> int:
+    """
+    Return a random integer N with low <= N <= high.
+
+    Same result range as random.randint, but with a single call into the
+    C generator instead of randint's argument checks and rejection loop.
+    """
+    return low + int(random.random() * (high - low + 1))
 
 
 def _get_range(config: DifficultyConfig, operation: Operation) -> tuple[int, int]:
@@ -119,118 +142,88 @@ def _get_range(config: DifficultyConfig, operation: Operation) -> tuple[int, int
     return config.number_range
 
 
-def _generate_addition(config: DifficultyConfig) -> MathQuestion:
-    """Generate an addition question within the configured range."""
-    min_num, max_num = _get_range(config, Operation.ADDITION)
-
-    # Generate operands within range, ensuring sum doesn't exceed max
-    operand1 = random.randint(min_num, max_num)
-    # Ensure operand2 is at least min_num but sum doesn't exceed max
-    max_operand2 = max(min_num, max_num - operand1)
-    operand2 = random.randint(min_num, max_operand2)
-
-    answer = operand1 + operand2
-    operation = Operation.ADDITION
-
-    question_text = (
+@lru_cache(maxsize=4096)
+def _question_text(operation: Operation, operand1: int, operand2: int) -> str:
+    """Build the German question text, memoized per operand pair."""
+    return (
         f"Was ist {_number_to_german_speech(operand1)} "
         f"{OPERATION_WORDS_GERMAN[operation]} "
         f"{_number_to_german_speech(operand2)}?"
     )
 
+
+def _make_question(operation: Operation, operand1: int, operand2: int, answer: int) -> MathQuestion:
+    """Build a MathQuestion with its ID and German question text."""
     return MathQuestion(
         question_id=generate_question_id(operation, operand1, operand2),
         operand1=operand1,
         operand2=operand2,
         operation=operation,
         correct_answer=answer,
-        question_text_german=question_text,
+        question_text_german=_question_text(operation, operand1, operand2),
     )
 
 
+def _generate_addition(config: DifficultyConfig) -> MathQuestion:
+    """Generate an addition question within the configured range."""
+    min_num, max_num = _get_range(config, Operation.ADDITION)
+
+    # Generate operands within range, ensuring sum doesn't exceed max
+    operand1 = _randint(min_num, max_num)
+    # Ensure operand2 is at least min_num but sum doesn't exceed max
+    max_operand2 = max(min_num, max_num - operand1)
+    operand2 = _randint(min_num, max_operand2)
+
+    answer = operand1 + operand2
+    operation = Operation.ADDITION
+
+    return _make_question(operation, operand1, operand2, answer)
+
+
 def _generate_subtraction(config: DifficultyConfig) -> MathQuestion:
     """Generate a subtraction question ensuring no negative results."""
     min_num, max_num = _get_range(config, Operation.SUBTRACTION)
 
     # Generate operands such that result is non-negative and both are in range
-    operand1 = random.randint(min_num, max_num)
-    operand2 = random.randint(min_num, operand1)  # operand2 <= operand1
+    operand1 = _randint(min_num, max_num)
+    operand2 = _randint(min_num, operand1)  # operand2 <= operand1
 
     answer = operand1 - operand2
     operation = Operation.SUBTRACTION
 
-    question_text = (
-        f"Was ist {_number_to_german_speech(operand1)} "
-        f"{OPERATION_WORDS_GERMAN[operation]} "
-        f"{_number_to_german_speech(operand2)}?"
-    )
-
-    return MathQuestion(
-        question_id=generate_question_id(operation, operand1, operand2),
-        operand1=operand1,
-        operand2=operand2,
-        operation=operation,
-        correct_answer=answer,
-        question_text_german=question_text,
-    )
+    return _make_question(operation, operand1, operand2, answer)
 
 
 def _generate_multiplication(config: DifficultyConfig) -> MathQuestion:
     """Generate a multiplication question using configured times tables."""
-    tables = config.multiplication_tables or [2, 5, 10]
+    tables = config.multiplication_tables or (2, 5, 10)
 
     # One operand from the times tables, one from 1-10
     operand1 = random.choice(tables)
-    operand2 = random.randint(1, 10)
+    operand2 = _randint(1, 10)
 
     # Randomly swap order for variety
-    if random.choice([True, False]):
+    if random.random() < 0.5:
         operand1, operand2 = operand2, operand1
 
     answer = operand1 * operand2
     operation = Operation.MULTIPLICATION
 
-    question_text = (
-        f"Was ist {_number_to_german_speech(operand1)} "
-        f"{OPERATION_WORDS_GERMAN[operation]} "
-        f"{_number_to_german_speech(operand2)}?"
-    )
-
-    return MathQuestion(
-        question_id=generate_question_id(operation, operand1, operand2),
-        operand1=operand1,
-        operand2=operand2,
-        operation=operation,
-        correct_answer=answer,
-        question_text_german=question_text,
-    )
+    return _make_question(operation, operand1, operand2, answer)
 
 
 def _generate_division(config: DifficultyConfig) -> MathQuestion:
     """Generate a division question with whole number results."""
-    tables = config.multiplication_tables or list(range(1, 11))
+    tables = config.multiplication_tables or tuple(range(1, 11))
 
     # Generate from multiplication facts to ensure clean division
     divisor = random.choice(tables)
-    quotient = random.randint(1, 10)
+    quotient = _randint(1, 10)
     dividend = divisor * quotient  # This ensures clean division
 
     operation = Operation.DIVISION
 
-    question_text = (
-        f"Was ist {_number_to_german_speech(dividend)} "
-        f"{OPERATION_WORDS_GERMAN[operation]} "
-        f"{_number_to_german_speech(divisor)}?"
-    )
-
-    return MathQuestion(
-        question_id=generate_question_id(operation, dividend, divisor),
-        operand1=dividend,
-        operand2=divisor,
-        operation=operation,
-        correct_answer=quotient,
-        question_text_german=question_text,
-    )
+    return _make_question(operation, dividend, divisor, quotient)
 
 
 # Map operations to their generator functions
@@ -242,6 +235,110 @@ _OPERATION_GENERATORS: dict[Operation, Callable[[DifficultyConfig], MathQuestion
 }
 
 
+# ============================================================================
+# Precomputed question pools
+# ============================================================================
+
+# Question spaces up to this size are built once and sampled from;
+# larger ones (e.g. grade 4 addition) keep using the generator functions.
+_POOL_MAX_SIZE = 10_000
+
+
+def _addition_outcomes(config: DifficultyConfig) -> Iterator[tuple[int, int, int, float]]:
+    """Yield (operand1, operand2, answer, probability) as drawn by _generate_addition."""
+    min_num, max_num = _get_range(config, Operation.ADDITION)
+    p_operand1 = 1 / (max_num - min_num + 1)
+    for operand1 in range(min_num, max_num + 1):
+        max_operand2 = max(min_num, max_num - operand1)
+        p_operand2 = 1 / (max_operand2 - min_num + 1)
+        for operand2 in range(min_num, max_operand2 + 1):
+            yield operand1, operand2, operand1 + operand2, p_operand1 * p_operand2
+
+
+def _subtraction_outcomes(config: DifficultyConfig) -> Iterator[tuple[int, int, int, float]]:
+    """Yield (operand1, operand2, answer, probability) as drawn by _generate_subtraction."""
+    min_num, max_num = _get_range(config, Operation.SUBTRACTION)
+    p_operand1 = 1 / (max_num - min_num + 1)
+    for operand1 in range(min_num, max_num + 1):
+        p_operand2 = 1 / (operand1 - min_num + 1)
+        for operand2 in range(min_num, operand1 + 1):
+            yield operand1, operand2, operand1 - operand2, p_operand1 * p_operand2
+
+
+def _multiplication_outcomes(config: DifficultyConfig) -> Iterator[tuple[int, int, int, float]]:
+    """Yield (operand1, operand2, answer, probability) as drawn by _generate_multiplication."""
+    tables = config.multiplication_tables or (2, 5, 10)
+    p = 1 / (len(tables) * 10 * 2)  # table, factor 1-10, swapped or not
+    for table in tables:
+        for factor in range(1, 11):
+            yield table, factor, table * factor, p
+            yield factor, table, table * factor, p
+
+
+def _division_outcomes(config: DifficultyConfig) -> Iterator[tuple[int, int, int, float]]:
+    """Yield (operand1, operand2, answer, probability) as drawn by _generate_division."""
+    tables = config.multiplication_tables or tuple(range(1, 11))
+    p = 1 / (len(tables) * 10)
+    for divisor in tables:
+        for quotient in range(1, 11):
+            yield divisor * quotient, divisor, quotient, p
+
+
+_OPERATION_OUTCOMES: dict[
+    Operation, Callable[[DifficultyConfig], Iterator[tuple[int, int, int, float]]]
+] = {
+    Operation.ADDITION: _addition_outcomes,
+    Operation.SUBTRACTION: _subtraction_outcomes,
+    Operation.MULTIPLICATION: _multiplication_outcomes,
+    Operation.DIVISION: _division_outcomes,
+}
+
+
+def _build_pool(
+    config: DifficultyConfig, operation: Operation
+) -> tuple[tuple[MathQuestion, ...], list[float]] | None:
+    """
+    Build every question an operation can produce for a grade, with cumulative weights.
+
+    Sampling the pool with the cumulative weights reproduces the distribution
+    of the generator function. Returns None if the question space is larger
+    than _POOL_MAX_SIZE.
+    """
+    weights: dict[tuple[int, int], float] = {}
+    answers: dict[tuple[int, int], int] = {}
+    for operand1, operand2, answer, p in _OPERATION_OUTCOMES[operation](config):
+        key = (operand1, operand2)
+        if key not in weights:
+            if len(weights) == _POOL_MAX_SIZE:
+                return None
+            weights[key] = 0.0
+            answers[key] = answer
+        weights[key] += p
+
+    questions = tuple(
+        _make_question(operation, operand1, operand2, answers[operand1, operand2])
+        for operand1, operand2 in weights
+    )
+    return questions, list(itertools.accumulate(weights.values()))
+
+
+@cache
+def _pool_for(
+    grade: int, operation: Operation
+) -> tuple[tuple[MathQuestion, ...], list[float]] | None:
+    """
+    Get the question pool for a grade and operation, building it on first use.
+
+    A warm container usually serves one grade, so pools are built lazily
+    instead of at import. Returns None if the grade does not offer the
+    operation or its question space is too large to pool.
+    """
+    config = GRADE_CONFIGS.get(grade)
+    if config is None or operation not in config.operations:
+        return None
+    return _build_pool(config, operation)
+
+
 def generate_question(
     grade: int = 1,
     operation: Operation | None = None,
@@ -275,6 +372,11 @@ def generate_question(
             f"Available operations: {[op.value for op in config.operations]}"
         )
 
+    pool = _pool_for(grade, operation)
+    if pool is not None:
+        questions, cum_weights = pool
+        return random.choices(questions, cum_weights=cum_weights)[0]
+
     generator = _OPERATION_GENERATORS[operation]
     return generator(config)
 
@@ -295,14 +397,34 @@ def generate_question_set(
     Returns:
         A list of MathQuestion instances.
     """
+    if operation is not None:
+        return _draw_questions(grade, operation, count)
+    if grade not in GRADE_CONFIGS:
+        raise ValueError(
+            f"Unsupported grade: {grade}. Supported grades: {list(GRADE_CONFIGS.keys())}"
+        )
+
+    # Pick all operations in one call, then draw each operation's questions
+    # in one batch and hand them out in the picked order
+    operations = random.choices(GRADE_CONFIGS[grade].operations, k=count)
+    batches = {op: iter(_draw_questions(grade, op, operations.count(op))) for op in set(operations)}
+    return [next(batches[op]) for op in operations]
+
+
+def _draw_questions(grade: int, operation: Operation, count: int) -> list[MathQuestion]:
+    """Draw ``count`` questions of one operation, in a single call when the operation is pooled."""
+    pool = _pool_for(grade, operation)
+    if pool is not None:
+        questions, cum_weights = pool
+        return random.choices(questions, cum_weights=cum_weights, k=count)
     return [generate_question(grade=grade, operation=operation) for _ in range(count)]
 
 
-def get_available_operations(grade: int) -> list[Operation]:
-    """Get the list of available operations for a given grade."""
+def get_available_operations(grade: int) -> tuple[Operation, ...]:
+    """Get the available operations for a given grade."""
     if grade not in GRADE_CONFIGS:
         raise ValueError(f"Unsupported grade: {grade}")
-    return GRADE_CONFIGS[grade].operations.copy()
+    return GRADE_CONFIGS[grade].operations
 
 
 def get_grade_config(grade: int) -> DifficultyConfig:
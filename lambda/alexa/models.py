@@ -5,11 +5,49 @@ This module defines the data structures used for tracking user progress
 and spaced repetition learning.
 """
 
+import sys
 from dataclasses import dataclass, field
 from datetime import datetime
+from decimal import Decimal
 
 
-@dataclass
+def to_timestamp(value: datetime | float | None) -> int | None:
+    """Convert a datetime (or Unix seconds) to whole Unix seconds for persistence."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return int(value.timestamp())
+    return int(value)
+
+
+def to_epoch_seconds(value: int | Decimal | str | None) -> float | None:
+    """
+    Convert a stored timestamp to Unix seconds.
+
+    Accepts the ISO strings written by older versions as well.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value).timestamp()
+    return float(value)
+
+
+def from_timestamp(value: int | Decimal | str | None) -> datetime | None:
+    """
+    Convert a stored timestamp back to a datetime.
+
+    Accepts Unix seconds (DynamoDB returns numbers as Decimal) as well as
+    the ISO strings written by older versions.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(int(value))
+
+
+@dataclass(slots=True)
 class QuestionStats:
     """
     Statistics tracked for each question for spaced repetition.
@@ -22,7 +60,7 @@ class QuestionStats:
     question_id: str  # Matches MathQuestion.question_id, e.g., "add_7_5"
     correct_count: int = 0
     incorrect_count: int = 0
-    last_asked: datetime | None = None
+    last_asked: float | None = None  # Unix seconds, so age checks are plain float math
     box: int = 1  # Leitner box (1-5), starts at 1
 
     @property
@@ -43,27 +81,23 @@ class QuestionStats:
             "question_id": self.question_id,
             "correct_count": self.correct_count,
             "incorrect_count": self.incorrect_count,
-            "last_asked": self.last_asked.isoformat() if self.last_asked else None,
+            "last_asked": to_timestamp(self.last_asked),
             "box": self.box,
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> QuestionStats:
         """Create from dictionary (from persistence)."""
-        last_asked = None
-        if data.get("last_asked"):
-            last_asked = datetime.fromisoformat(data["last_asked"])
-
         return cls(
-            question_id=data["question_id"],
+            question_id=sys.intern(data["question_id"]),
             correct_count=data.get("correct_count", 0),
             incorrect_count=data.get("incorrect_count", 0),
-            last_asked=last_asked,
+            last_asked=to_epoch_seconds(data.get("last_asked")),
             box=data.get("box", 1),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class UserProfile:
     """
     User profile containing learning preferences and overall statistics.
@@ -96,21 +130,13 @@ class UserProfile:
             "total_correct": self.total_correct,
             "current_streak": self.current_streak,
             "best_streak": self.best_streak,
-            "last_session": self.last_session.isoformat() if self.last_session else None,
-            "created_at": self.created_at.isoformat(),
+            "last_session": to_timestamp(self.last_session),
+            "created_at": to_timestamp(self.created_at),
         }
 
     @classmethod
     def from_dict(cls, data: dict) -> UserProfile:
         """Create from dictionary (from persistence)."""
-        last_session = None
-        if data.get("last_session"):
-            last_session = datetime.fromisoformat(data["last_session"])
-
-        created_at = datetime.now()
-        if data.get("created_at"):
-            created_at = datetime.fromisoformat(data["created_at"])
-
         return cls(
             user_id=data["user_id"],
             name=data.get("name"),
@@ -119,6 +145,6 @@ class UserProfile:
             total_correct=data.get("total_correct", 0),
             current_streak=data.get("current_streak", 0),
             best_streak=data.get("best_streak", 0),
-            last_session=last_session,
-            created_at=created_at,
+            last_session=from_timestamp(data.get("last_session")),
+            created_at=from_timestamp(data.get("created_at")) or datetime.now(),
         )
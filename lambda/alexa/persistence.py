@@ -11,10 +11,19 @@ Uses a single-table design with the user_id as partition key.
 All data for a user is stored in a single DynamoDB item.
 """
 
+import copy
+import json
+import time
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping, MutableMapping
+from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime
-from typing import TYPE_CHECKING
+from decimal import Decimal
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, cast
 
-from alexa.models import QuestionStats, UserProfile
+from alexa.models import QuestionStats, UserProfile, to_timestamp
 
 if TYPE_CHECKING:
     from ask_sdk_core.handler_input import HandlerInput
@@ -24,6 +33,138 @@ if TYPE_CHECKING:
 ATTR_USER_PROFILE = "user_profile"
 ATTR_QUESTION_STATS = "question_stats"
 ATTR_SESSION_STATS = "session_stats"
+ATTR_VERSION = "version"  # Bumped on every write of the item
+
+# Session statistics of a player who has not played yet (copied before use)
+_DEFAULT_SESSION_STATS: Mapping[str, int | None] = MappingProxyType(
+    {
+        "total_questions": 0,
+        "total_correct": 0,
+        "streak_current": 0,
+        "streak_best": 0,
+        "sessions_count": 0,
+        "last_session": None,
+    }
+)
+
+# Request attribute holding the request's shared PersistenceManager
+REQUEST_PERSISTENCE_MANAGER = "persistence_manager"
+
+# Warm Lambda containers serve several turns of the same dialog, so the
+# account's persistent attributes are kept per user ID after each load and
+# write, and reused instead of reading DynamoDB again. Turns of one session
+# can be served by different containers, so an entry is only reused while its
+# item version matches the version the session last read or wrote (see
+# SESSION_ATTRIBUTES_VERSION); entries also expire after a short TTL.
+# Cached copies only serve reads: other sessions (e.g. another player on a
+# second device) may have written the item since, and commit() writes the
+# whole item, so a request reads it again before its first change.
+_ATTRIBUTES_CACHE_MAX_ENTRIES = 128
+_ATTRIBUTES_CACHE_TTL_SECONDS = 5 * 60
+_ATTRIBUTES_CACHE: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+# Session key for the item version this session last read or wrote
+SESSION_ATTRIBUTES_VERSION = "attributes_version"
+
+# Session flag set once the account is known to have no stored item, so later
+# turns of the same session skip the DynamoDB read
+SESSION_NO_PERSISTED_DATA = "no_persisted_data"
+
+
+@dataclass(frozen=True)
+class PlayerSnapshot:
+    """What the greeting needs to know about a player, read in one pass."""
+
+    is_new: bool
+    total_questions: int = 0
+    total_correct: int = 0
+
+
+def _serialize_question_stats(stats: QuestionStats) -> dict:
+    """Stored form of one question's stats; the question_id is the key, so it is left out."""
+    return {
+        "correct_count": stats.correct_count,
+        "incorrect_count": stats.incorrect_count,
+        "last_asked": to_timestamp(stats.last_asked),
+        "box": stats.box,
+    }
+
+
+def _json_number(value: object) -> int | float:
+    """Encode DynamoDB Decimals from maps written by older versions."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class LazyQuestionStats(MutableMapping[str, QuestionStats]):
+    """
+    Question stats of a player, parsed from their stored form on first access.
+
+    Serving a turn usually touches a handful of questions, so entries stay in
+    their stored dict form until they are read. Entries that were never read
+    can be written back as they are (see PersistenceManager.save_question_stats).
+    """
+
+    def __init__(self, stored: dict[str, dict] | None = None):
+        self._stored = stored if stored is not None else {}  # never modified
+        self._parsed: dict[str, QuestionStats] = {}
+
+    def __getitem__(self, question_id: str) -> QuestionStats:
+        stats = self._parsed.get(question_id)
+        if stats is None:
+            # Entries are stored without their question_id (it is the key)
+            data = self._stored[question_id]
+            stats = QuestionStats.from_dict({"question_id": question_id, **data})
+            self._parsed[question_id] = stats
+        return stats
+
+    def __setitem__(self, question_id: str, stats: QuestionStats) -> None:
+        self._parsed[question_id] = stats
+
+    def __delitem__(self, question_id: str) -> None:
+        if question_id in self._stored:
+            self._stored = {k: v for k, v in self._stored.items() if k != question_id}
+            self._parsed.pop(question_id, None)
+        else:
+            del self._parsed[question_id]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._stored
+        for question_id in self._parsed:
+            if question_id not in self._stored:
+                yield question_id
+
+    def __len__(self) -> int:
+        return len(self._stored) + sum(1 for q in self._parsed if q not in self._stored)
+
+    def __contains__(self, question_id: object) -> bool:
+        return question_id in self._stored or question_id in self._parsed
+
+    def copy(self) -> LazyQuestionStats:
+        """Shallow copy: parsed QuestionStats objects are shared with the original."""
+        clone = LazyQuestionStats(self._stored)
+        clone._parsed = self._parsed.copy()
+        return clone
+
+    __copy__ = copy
+
+    def serialized(self) -> dict[str, dict]:
+        """Stored form of all entries; entries that were never read are passed through."""
+        data = dict(self._stored)
+        for question_id, stats in self._parsed.items():
+            data[question_id] = _serialize_question_stats(stats)
+        return data
+
+
+def _item_version(attrs: Mapping[str, Any]) -> int:
+    """Version stamp of the stored item (0 for items written before it was added)."""
+    return int(attrs.get(ATTR_VERSION, 0))
+
+
+def _fingerprint(attrs: dict) -> str:
+    """Canonical JSON form of the persistent attributes, to tell whether they changed."""
+    return json.dumps(attrs, sort_keys=True, separators=(",", ":"), default=str)
 
 
 class PersistenceManager:
@@ -50,7 +191,17 @@ class PersistenceManager:
         self._handler_input = handler_input
         self._attributes_manager = handler_input.attributes_manager
         self._persistent_attrs: dict | None = None
+        self._attrs_from_db = False  # Whether _persistent_attrs were read in this request
+        # Item content before its first change since the last load or save; taken
+        # lazily, so requests that only read never serialize the item
+        self._stored_fingerprint: str | None = None
+        self._profile: UserProfile | None = None  # Memoized profile of the current player
+        self._player_data: dict | None = None  # The current player's stored dict, once found
+        self._stats_data: dict | None = None  # Decoded question stats of the current player
         self._dirty = False  # Track if we have unsaved changes
+        self._transaction_depth = 0  # commit() is deferred while > 0
+        self._now: datetime | None = None  # Request timestamp, taken on first use
+        self._now_iso: str | None = None
 
         # Get player name from parameter or session
         if player_name:
@@ -64,6 +215,22 @@ class PersistenceManager:
         """Get the unique user ID from the request."""
         return self._handler_input.request_envelope.context.system.user.user_id
 
+    def _session_attributes(self) -> dict[str, Any]:
+        """Get the session attributes (Optional in the SDK types, but set for skill requests)."""
+        return cast(dict[str, Any], self._attributes_manager.session_attributes)
+
+    def _request_time(self) -> datetime:
+        """Get the current time, taken once per request and reused afterwards."""
+        if self._now is None:
+            self._now = datetime.now()
+        return self._now
+
+    def _request_time_iso(self) -> str:
+        """Get the request timestamp as an ISO string, formatted once."""
+        if self._now_iso is None:
+            self._now_iso = self._request_time().isoformat()
+        return self._now_iso
+
     def _get_player_data(self) -> dict:
         """
         Get the data dictionary for the current player.
@@ -71,11 +238,17 @@ class PersistenceManager:
         Returns:
             Dictionary with the player's data, or empty dict if no player set.
         """
+        if self._player_data is not None:
+            return self._player_data
         if not self._player_name:
             return {}
         attrs = self._load_persistent_attributes()
-        players = attrs.get("players", {})
-        return players.get(self._player_name, {})
+        player_data = attrs.get("players", {}).get(self._player_name)
+        if player_data is None:
+            # Not memoized: a player only exists once their data is saved
+            return {}
+        self._player_data = player_data
+        return player_data
 
     def _save_player_data(self, data: dict) -> None:
         """
@@ -86,10 +259,10 @@ class PersistenceManager:
         """
         if not self._player_name:
             return
-        attrs = self._load_persistent_attributes()
-        if "players" not in attrs:
-            attrs["players"] = {}
-        attrs["players"][self._player_name] = data
+        if data is not self._player_data:
+            attrs = self._load_persistent_attributes()
+            attrs.setdefault("players", {})[self._player_name] = data
+            self._player_data = data
         self._dirty = True
 
     def set_current_player(self, name: str) -> None:
@@ -100,10 +273,37 @@ class PersistenceManager:
             name: The player's name.
         """
         self._player_name = name.lower().strip()
+        self._profile = None
+        self._player_data = None
+        self._stats_data = None
         # Also store in session for subsequent requests
         session_attr = self._handler_input.attributes_manager.session_attributes
         session_attr["current_player"] = self._player_name
 
+    def load_player(self, name: str) -> PlayerSnapshot:
+        """
+        Select a player and summarize their stored data.
+
+        Reads the player's record once instead of separate is_new_player()
+        and get_session_stats() lookups.
+
+        Args:
+            name: The player's name.
+
+        Returns:
+            PlayerSnapshot for the selected player.
+        """
+        self.set_current_player(name)
+        player_data = self._get_player_data()
+        if ATTR_USER_PROFILE not in player_data:
+            return PlayerSnapshot(is_new=True)
+        stats = player_data.get(ATTR_SESSION_STATS, {})
+        return PlayerSnapshot(
+            is_new=False,
+            total_questions=stats.get("total_questions", 0),
+            total_correct=stats.get("total_correct", 0),
+        )
+
     def get_current_player(self) -> str | None:
         """Get the current player name."""
         return self._player_name
@@ -137,32 +337,99 @@ class PersistenceManager:
         """
         Lazy-load persistent attributes from DynamoDB.
 
+        The warm cache is used only if its entry has the item version this
+        session last read or wrote; otherwise the item is read again.
+
         Returns:
             Dictionary of persistent attributes.
         """
-        if self._persistent_attrs is None:
-            self._persistent_attrs = self._attributes_manager.persistent_attributes
-        return self._persistent_attrs
+        if self._persistent_attrs is not None:
+            return self._persistent_attrs
+
+        session_attr = self._session_attributes()
+        cached = _ATTRIBUTES_CACHE.get(self._get_user_id())
+        if session_attr.get(SESSION_NO_PERSISTED_DATA):
+            attrs: dict = {}
+        elif (
+            cached
+            and time.monotonic() - cached[0] < _ATTRIBUTES_CACHE_TTL_SECONDS
+            and _item_version(cached[1]) == session_attr.get(SESSION_ATTRIBUTES_VERSION)
+        ):
+            attrs = copy.deepcopy(cached[1])
+        else:
+            attrs = self._read_persistent_attributes()
+        self._persistent_attrs = attrs
+        return attrs
+
+    def _read_persistent_attributes(self) -> dict:
+        """Read the item from DynamoDB and note its version in session and the warm cache."""
+        attrs = self._attributes_manager.persistent_attributes
+        self._attrs_from_db = True
+        session_attr = self._session_attributes()
+        session_attr[SESSION_ATTRIBUTES_VERSION] = _item_version(attrs)
+        self._remember_attributes(attrs)
+        if attrs:
+            session_attr.pop(SESSION_NO_PERSISTED_DATA, None)
+        else:
+            session_attr[SESSION_NO_PERSISTED_DATA] = True
+        return attrs
+
+    def begin_change(self) -> None:
+        """
+        Prepare the item for its first change in this request.
+
+        The mutating methods call this themselves; call it directly before
+        reading data that a later change is computed from (e.g. question
+        stats that buffered answers are applied to).
+
+        Attributes from the warm cache (or the no-data marker) are replaced by
+        a fresh read, so the write never drops what other sessions stored in
+        the meantime. The item is then fingerprinted, so commit() can tell
+        whether the changes left it as it was. Must be called before the
+        loaded attributes are read for a change or modified in place.
+        """
+        if not self._attrs_from_db:
+            self._persistent_attrs = self._read_persistent_attributes()
+            self._player_data = None
+            self._stats_data = None
+            self._profile = None
+            self._stored_fingerprint = None
+        if self._stored_fingerprint is None:
+            self._stored_fingerprint = _fingerprint(self._load_persistent_attributes())
+
+    def _remember_attributes(self, attrs: dict) -> None:
+        """Store a copy of the persistent attributes in the warm cache."""
+        user_id = self._get_user_id()
+        _ATTRIBUTES_CACHE[user_id] = (time.monotonic(), copy.deepcopy(attrs))
+        _ATTRIBUTES_CACHE.move_to_end(user_id)
+        while len(_ATTRIBUTES_CACHE) > _ATTRIBUTES_CACHE_MAX_ENTRIES:
+            _ATTRIBUTES_CACHE.popitem(last=False)
 
     def get_user_profile(self) -> UserProfile:
         """
         Load or create the user profile for the current player.
 
+        The profile is memoized on the manager, so repeated calls within a
+        request return the same object.
+
         Returns:
             UserProfile for the current player.
         """
+        if self._profile is not None:
+            return self._profile
+
         player_data = self._get_player_data()
 
         if ATTR_USER_PROFILE in player_data:
-            return UserProfile.from_dict(player_data[ATTR_USER_PROFILE])
-
-        # New player - create a new profile
-        user_id = self._get_user_id()
-        return UserProfile(
-            user_id=user_id,
-            name=self._player_name,
-            created_at=datetime.now(),
-        )
+            self._profile = UserProfile.from_dict(player_data[ATTR_USER_PROFILE])
+        else:
+            # New player - create a new profile
+            self._profile = UserProfile(
+                user_id=self._get_user_id(),
+                name=self._player_name,
+                created_at=self._request_time(),
+            )
+        return self._profile
 
     def save_user_profile(self, profile: UserProfile) -> None:
         """
@@ -171,44 +438,115 @@ class PersistenceManager:
         Args:
             profile: The UserProfile to save.
         """
+        self.begin_change()
         player_data = self._get_player_data()
         player_data[ATTR_USER_PROFILE] = profile.to_dict()
         self._save_player_data(player_data)
+        self._profile = profile
 
-    def get_question_stats(self) -> dict[str, QuestionStats]:
+    def update_user_profile(self, **fields) -> None:
         """
-        Load question statistics for SRS for the current player.
+        Set individual profile fields for the current player.
 
-        Returns:
-            Dictionary mapping question_id to QuestionStats.
+        Updates the stored profile in place instead of rebuilding and
+        re-serializing the whole UserProfile. Values must already be in
+        their stored form (e.g. ``grade=3``). A player without a stored
+        profile gets a new one.
+
+        Args:
+            **fields: Profile fields to set.
         """
+        self.begin_change()
         player_data = self._get_player_data()
-        stats_data = player_data.get(ATTR_QUESTION_STATS, {})
+        stored = player_data.get(ATTR_USER_PROFILE)
+        if stored is None:
+            profile = self.get_user_profile()
+            for name, value in fields.items():
+                setattr(profile, name, value)
+            self.save_user_profile(profile)
+            return
+
+        stored.update(fields)
+        self._save_player_data(player_data)
+        if self._profile is not None:
+            for name, value in fields.items():
+                setattr(self._profile, name, value)
+
+    def get_question_stats(self) -> LazyQuestionStats:
+        """
+        Load question statistics for SRS for the current player.
 
-        result = {}
-        for question_id, data in stats_data.items():
-            # Add question_id to data if not present (for backwards compatibility)
-            if "question_id" not in data:
-                data["question_id"] = question_id
-            result[question_id] = QuestionStats.from_dict(data)
+        Entries are parsed on first access, so only the questions a turn
+        actually reads are turned into QuestionStats objects.
 
-        return result
+        Returns:
+            Mapping of question_id to QuestionStats.
+        """
+        return LazyQuestionStats(dict(self._get_stats_data()))
 
-    def save_question_stats(self, stats: dict[str, QuestionStats]) -> None:
+    def save_question_stats(self, stats: Mapping[str, QuestionStats]) -> None:
         """
         Save question statistics for the current player.
 
         Args:
-            stats: Dictionary mapping question_id to QuestionStats.
+            stats: Mapping of question_id to QuestionStats.
+        """
+        # Keyed by question_id for efficient lookups. The ID is the key, so it
+        # is not repeated inside each entry (see LazyQuestionStats, which
+        # restores it on load).
+        self.begin_change()
+        if isinstance(stats, LazyQuestionStats):
+            self._stats_data = stats.serialized()
+        else:
+            self._stats_data = {
+                question_id: _serialize_question_stats(s) for question_id, s in stats.items()
+            }
+        self._store_stats_data()
+
+    def update_question_stats(self, changed: dict[str, QuestionStats]) -> None:
         """
-        player_data = self._get_player_data()
+        Write only the given question stats into the stored stats of the current player.
 
-        # Store as a dictionary keyed by question_id for efficient lookups
-        stats_data = {}
-        for question_id, question_stats in stats.items():
-            stats_data[question_id] = question_stats.to_dict()
+        Entries that are not passed keep their stored form, so a request
+        that answered one question builds one entry instead of all.
 
-        player_data[ATTR_QUESTION_STATS] = stats_data
+        Args:
+            changed: Dictionary mapping question_id to the updated QuestionStats.
+        """
+        if not changed:
+            return
+        self.begin_change()
+        stats_data = self._get_stats_data()
+        for question_id, question_stats in changed.items():
+            stats_data[question_id] = _serialize_question_stats(question_stats)
+        self._store_stats_data()
+
+    def _get_stats_data(self) -> dict:
+        """
+        Get the current player's question stats in their stored (dict) form.
+
+        Stats are persisted as one JSON string, decoded here once per request.
+        Items written by older versions hold a plain map and are used as is.
+        """
+        if self._stats_data is None:
+            stored = self._get_player_data().get(ATTR_QUESTION_STATS)
+            if isinstance(stored, str):
+                self._stats_data = json.loads(stored)
+            else:
+                self._stats_data = stored or {}
+        return self._stats_data
+
+    def _store_stats_data(self) -> None:
+        """
+        Encode the question stats into the player data as a single JSON string.
+
+        Callers call begin_change() before changing the stats.
+        """
+        player_data = self._get_player_data()
+        encoded = json.dumps(self._stats_data, separators=(",", ":"), default=_json_number)
+        if player_data.get(ATTR_QUESTION_STATS) == encoded:
+            return  # Nothing changed (e.g. a session that ended without answers)
+        player_data[ATTR_QUESTION_STATS] = encoded
         self._save_player_data(player_data)
 
     def get_session_stats(self) -> dict:
@@ -218,18 +556,10 @@ class PersistenceManager:
         Returns:
             Dictionary with session statistics.
         """
-        player_data = self._get_player_data()
-        return player_data.get(
-            ATTR_SESSION_STATS,
-            {
-                "total_questions": 0,
-                "total_correct": 0,
-                "streak_current": 0,
-                "streak_best": 0,
-                "sessions_count": 0,
-                "last_session": None,
-            },
-        )
+        stats = self._get_player_data().get(ATTR_SESSION_STATS)
+        if stats is None:
+            return dict(_DEFAULT_SESSION_STATS)
+        return stats
 
     def save_session_stats(self, stats: dict) -> None:
         """
@@ -238,6 +568,7 @@ class PersistenceManager:
         Args:
             stats: Dictionary with session statistics.
         """
+        self.begin_change()
         player_data = self._get_player_data()
         player_data[ATTR_SESSION_STATS] = stats
         self._save_player_data(player_data)
@@ -259,43 +590,75 @@ class PersistenceManager:
         Returns:
             Updated session statistics.
         """
+        # The stored dict (or a copy of the defaults) is updated in place
+        self.begin_change()
         stats = self.get_session_stats()
+        streak = 0 if reset_streak else stats.get("streak_current", 0) + correct_answers
 
         stats["total_questions"] = stats.get("total_questions", 0) + questions_answered
         stats["total_correct"] = stats.get("total_correct", 0) + correct_answers
-
-        if reset_streak:
-            stats["streak_current"] = 0
-        else:
-            stats["streak_current"] = stats.get("streak_current", 0) + correct_answers
+        stats["streak_current"] = streak
 
         # Update best streak if current is higher
-        if stats["streak_current"] > stats.get("streak_best", 0):
-            stats["streak_best"] = stats["streak_current"]
+        if streak > stats.get("streak_best", 0):
+            stats["streak_best"] = streak
 
-        stats["last_session"] = datetime.now().isoformat()
+        stats["last_session"] = self._request_time_iso()
 
         self.save_session_stats(stats)
         return stats
 
     def increment_session_count(self) -> None:
         """Increment the session count (call at session start)."""
+        self.begin_change()
         stats = self.get_session_stats()
         stats["sessions_count"] = stats.get("sessions_count", 0) + 1
-        stats["last_session"] = datetime.now().isoformat()
+        stats["last_session"] = self._request_time_iso()
         self.save_session_stats(stats)
 
+    @contextmanager
+    def transaction(self) -> Iterator[PersistenceManager]:
+        """
+        Group several updates into a single DynamoDB write.
+
+        Calls to commit() inside the block are deferred; pending changes
+        are written once when the outermost block exits without an error.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+        self.commit()
+
     def commit(self) -> None:
         """
         Commit all pending changes to DynamoDB.
 
         Should be called at the end of request handling to
-        persist any changes made during the request.
+        persist any changes made during the request. Inside a
+        transaction() block the write is deferred until the block exits.
         """
-        if self._dirty and self._persistent_attrs is not None:
-            self._attributes_manager.persistent_attributes = self._persistent_attrs
-            self._attributes_manager.save_persistent_attributes()
-            self._dirty = False
+        if self._transaction_depth:
+            return
+        attrs = self._persistent_attrs
+        if not self._dirty or attrs is None:
+            return
+        self._dirty = False
+        # Changes that leave the item as it was loaded (e.g. setting a field
+        # to its current value) do not need a PutItem
+        fingerprint = _fingerprint(attrs)
+        if fingerprint == self._stored_fingerprint:
+            return
+        version = _item_version(attrs) + 1
+        attrs[ATTR_VERSION] = version
+        self._attributes_manager.persistent_attributes = attrs
+        self._attributes_manager.save_persistent_attributes()
+        self._stored_fingerprint = None  # Taken again before the next change
+        self._remember_attributes(attrs)
+        session_attr = self._session_attributes()
+        session_attr[SESSION_ATTRIBUTES_VERSION] = version
+        session_attr.pop(SESSION_NO_PERSISTED_DATA, None)
 
     def is_new_player(self) -> bool:
         """
@@ -312,7 +675,10 @@ class PersistenceManager:
 
 def get_persistence_manager(handler_input: HandlerInput) -> PersistenceManager:
     """
-    Factory function to get a PersistenceManager.
+    Factory function to get the PersistenceManager of the current request.
+
+    The manager is kept in the request attributes, so every caller within
+    one request shares its loaded attributes and pending changes.
 
     Args:
         handler_input: The ASK SDK handler input.
@@ -320,13 +686,19 @@ def get_persistence_manager(handler_input: HandlerInput) -> PersistenceManager:
     Returns:
         A PersistenceManager instance.
     """
-    return PersistenceManager(handler_input)
+    request_attr = handler_input.attributes_manager.request_attributes
+    pm = cast(PersistenceManager | None, request_attr.get(REQUEST_PERSISTENCE_MANAGER))
+    if pm is None:
+        pm = request_attr[REQUEST_PERSISTENCE_MANAGER] = PersistenceManager(handler_input)
+    return pm
 
 
 # Helper functions for common operations
 
 
-def load_srs_data(handler_input: HandlerInput) -> tuple[dict[str, QuestionStats], int]:
+def load_srs_data(
+    handler_input: HandlerInput,
+) -> tuple[MutableMapping[str, QuestionStats], int]:
     """
     Load SRS data and grade level for initializing SpacedRepetition.
 
@@ -334,7 +706,7 @@ def load_srs_data(handler_input: HandlerInput) -> tuple[dict[str, QuestionStats]
         handler_input: The ASK SDK handler input.
 
     Returns:
-        Tuple of (question_stats dict, grade level).
+        Tuple of (question_stats mapping, grade level).
     """
     pm = get_persistence_manager(handler_input)
     profile = pm.get_user_profile()
@@ -344,7 +716,7 @@ def load_srs_data(handler_input: HandlerInput) -> tuple[dict[str, QuestionStats]
 
 def save_srs_data(
     handler_input: HandlerInput,
-    question_stats: dict[str, QuestionStats],
+    question_stats: Mapping[str, QuestionStats],
     questions_answered: int = 0,
     correct_answers: int = 0,
     had_wrong_answer: bool = False,
@@ -16,9 +16,15 @@ On correct answer: Move up one box (max 5)
 On incorrect answer: Move back to box 1
 """
 
+import copy
+import operator
 import random
-from collections import defaultdict
-from datetime import datetime
+import re
+import time
+from collections import deque
+from collections.abc import Callable, Collection, Mapping, MutableMapping
+from functools import lru_cache
+from types import MappingProxyType
 
 from alexa.math_questions import (
     GRADE_CONFIGS,
@@ -45,6 +51,52 @@ BOX_WEIGHTS: dict[int, float] = {
 # Percentage of questions that should be new (not seen before)
 NEW_QUESTION_RATIO = 0.3
 
+# Attempts a question needs before it counts towards the strong areas
+STRONG_AREA_MIN_ATTEMPTS = 3
+
+# Question ID format: "{operation}_{operand1}_{operand2}", e.g. "add_7_5"
+_QUESTION_ID_RE = re.compile(r"(add|sub|mul|div)_(-?\d+)_(-?\d+)")
+
+
+def _divide(operand1: int, operand2: int) -> int:
+    return operand1 // operand2 if operand2 != 0 else 0
+
+
+# Operation code -> (operation, German word, answer function)
+_OPERATION_TABLE: dict[str, tuple[Operation, str, Callable[[int, int], int]]] = {
+    "add": (Operation.ADDITION, "plus", operator.add),
+    "sub": (Operation.SUBTRACTION, "minus", operator.sub),
+    "mul": (Operation.MULTIPLICATION, "mal", operator.mul),
+    "div": (Operation.DIVISION, "geteilt durch", _divide),
+}
+
+
+@lru_cache(maxsize=256)
+def _reconstruct_question(question_id: str) -> MathQuestion | None:
+    """
+    Reconstruct a MathQuestion from its ID, or None if the ID is malformed.
+
+    MathQuestion is immutable, so the same IDs recurring across a session
+    share one cached instance.
+    """
+    match = _QUESTION_ID_RE.fullmatch(question_id)
+    if match is None:
+        return None
+
+    op_str, op1_str, op2_str = match.groups()
+    operand1 = int(op1_str)
+    operand2 = int(op2_str)
+    operation, word, answer_fn = _OPERATION_TABLE[op_str]
+
+    return MathQuestion(
+        question_id=question_id,
+        operand1=operand1,
+        operand2=operand2,
+        operation=operation,
+        correct_answer=answer_fn(operand1, operand2),
+        question_text_german=f"Was ist {operand1} {word} {operand2}?",
+    )
+
 
 class SpacedRepetition:
     """
@@ -56,22 +108,29 @@ class SpacedRepetition:
 
     def __init__(
         self,
-        question_stats: dict[str, QuestionStats] | None = None,
+        question_stats: MutableMapping[str, QuestionStats] | None = None,
         grade: int = 1,
     ):
         """
         Initialize the SRS system.
 
         Args:
-            question_stats: Dictionary mapping question_id to QuestionStats.
+            question_stats: Mapping of question_id to QuestionStats.
                            If None, starts fresh.
             grade: The grade level to generate questions for.
         """
-        self._stats: dict[str, QuestionStats] = question_stats or {}
+        self._stats: MutableMapping[str, QuestionStats] = question_stats or {}
         self._grade = grade
         self._session_asked: set[str] = set()  # Questions asked this session
-        self._recent_questions: list[str] = []  # Last N questions to avoid immediate repeats
         self._max_recent = 5  # Don't repeat last 5 questions
+        # Last N questions to avoid immediate repeats, plus a set for membership tests
+        self._recent_questions: deque[str] = deque(maxlen=self._max_recent)
+        self._recent_set: set[str] = set()
+        self._changed: set[str] = set()  # Questions answered since the last save
+        # Per-operation [correct, attempts] totals, built on first use and then kept current
+        self._op_totals: dict[str, list[int]] | None = None
+        self._strong_op_totals: dict[str, list[int]] = {}
+        self._now: float | None = None  # Clock reading shared by this instance's calls
 
     @property
     def grade(self) -> int:
@@ -83,12 +142,37 @@ class SpacedRepetition:
         """Set the grade level."""
         self._grade = value
 
+    def _request_time(self) -> float:
+        """
+        Return the current time, read once per instance.
+
+        An instance serves a single request, so one clock reading is
+        enough for all answers and selections within it.
+        """
+        if self._now is None:
+            self._now = time.time()
+        return self._now
+
     @property
-    def question_stats(self) -> dict[str, QuestionStats]:
-        """Get all question statistics (for persistence)."""
-        return self._stats.copy()
+    def question_stats(self) -> Mapping[str, QuestionStats]:
+        """Read-only view of all question statistics (for persistence)."""
+        return MappingProxyType(self._stats)
+
+    def copy_stats(self) -> MutableMapping[str, QuestionStats]:
+        """Copy of the stats mapping that later answers do not add entries to."""
+        return copy.copy(self._stats)
+
+    def pop_changed_stats(self) -> dict[str, QuestionStats]:
+        """
+        Return the stats of questions answered since the last call (for persistence).
 
-    def get_next_question(self) -> MathQuestion:
+        Lets callers write only the entries that changed instead of all stats.
+        """
+        changed = {question_id: self._stats[question_id] for question_id in self._changed}
+        self._changed.clear()
+        return changed
+
+    def get_next_question(self, exclude: Collection[str] = ()) -> MathQuestion:
         """
         Select the next question based on SRS algorithm.
 
@@ -97,30 +181,54 @@ class SpacedRepetition:
         2. Mix in new questions periodically
         3. Avoid repeating recent questions
 
+        Args:
+            exclude: Question IDs that should not be returned, e.g. the
+                     questions already asked in the current quiz. Honored
+                     on a best-effort basis when the grade's question
+                     space is exhausted.
+
         Returns:
             A MathQuestion selected according to SRS priorities.
         """
         # Decide whether to generate a new question or review
-        if self._should_generate_new():
-            return self._generate_new_question()
+        if self._should_generate_new(exclude):
+            return self._generate_new_question(exclude)
 
         # Try to select from existing questions using SRS
-        selected = self._select_from_srs()
+        selected = self._select_from_srs(exclude)
         if selected:
             return selected
 
         # Fallback: generate a new question
-        return self._generate_new_question()
+        return self._generate_new_question(exclude)
 
-    def _should_generate_new(self) -> bool:
+    def get_next_questions(self, count: int, exclude: Collection[str] = ()) -> list[MathQuestion]:
+        """
+        Select several distinct questions at once, e.g. to plan a whole quiz.
+
+        Args:
+            count: Number of questions to select.
+            exclude: Question IDs that should not be returned.
+
+        Returns:
+            A list of ``count`` MathQuestions in the order they should be asked.
+        """
+        planned_ids = set(exclude)
+        questions = []
+        for _ in range(count):
+            question = self.get_next_question(exclude=planned_ids)
+            planned_ids.add(question.question_id)
+            questions.append(question)
+        return questions
+
+    def _should_generate_new(self, exclude: Collection[str] = ()) -> bool:
         """Determine if we should generate a new question vs review."""
         if not self._stats:
             return True
 
-        # Count questions available for review (not recently asked)
-        available = [q_id for q_id in self._stats if q_id not in self._recent_questions]
-
-        if not available:
+        # Stop at the first question available for review (not recently asked or excluded)
+        recent = self._recent_set
+        if not any(q_id not in recent and q_id not in exclude for q_id in self._stats):
             return True
 
         # Use new question ratio with some randomness
@@ -133,61 +241,48 @@ class SpacedRepetition:
         Questions from higher grades (with larger numbers) should not be
         shown when playing at a lower grade.
         """
-        try:
-            parts = question_id.split("_")
-            if len(parts) != 3:
-                return False
-
-            op_str, op1_str, op2_str = parts
-            operand1 = int(op1_str)
-            operand2 = int(op2_str)
-
-            config = GRADE_CONFIGS.get(self._grade)
-            if not config:
-                return False
-
-            max_num = config.number_range[1]
-
-            # Check if operands are within grade's number range
-            if operand1 > max_num or operand2 > max_num:
-                return False
-
-            # Check if operation is available for this grade
-            op_map = {
-                "add": Operation.ADDITION,
-                "sub": Operation.SUBTRACTION,
-                "mul": Operation.MULTIPLICATION,
-                "div": Operation.DIVISION,
-            }
-            operation = op_map.get(op_str)
-            return operation in config.operations
-        except (ValueError, IndexError):
+        match = _QUESTION_ID_RE.fullmatch(question_id)
+        if match is None:
+            return False
+
+        op_str, op1_str, op2_str = match.groups()
+        config = GRADE_CONFIGS.get(self._grade)
+        if not config:
+            return False
+
+        max_num = config.number_range[1]
+
+        # Check if operands are within grade's number range
+        if int(op1_str) > max_num or int(op2_str) > max_num:
             return False
 
-    def _select_from_srs(self) -> MathQuestion | None:
+        # Check if operation is available for this grade
+        return _OPERATION_TABLE[op_str][0] in config.operations
+
+    def _select_from_srs(self, exclude: Collection[str] = ()) -> MathQuestion | None:
         """
         Select a question from existing stats using weighted box selection.
 
         Returns:
             A MathQuestion or None if no suitable question found.
         """
-        # Filter out recently asked questions AND questions inappropriate for current grade
+        # Filter out recently asked/excluded questions AND questions inappropriate for grade.
+        # The filters only need the IDs, so only the remaining entries are parsed.
+        stats = self._stats
+        recent = self._recent_set
         available_stats = [
-            stats
-            for q_id, stats in self._stats.items()
-            if q_id not in self._recent_questions and self._is_question_appropriate_for_grade(q_id)
+            stats[q_id]
+            for q_id in stats
+            if q_id not in recent
+            and q_id not in exclude
+            and self._is_question_appropriate_for_grade(q_id)
         ]
 
         if not available_stats:
             return None
 
-        # Group by box
-        by_box: dict[int, list[QuestionStats]] = defaultdict(list)
-        for stats in available_stats:
-            by_box[stats.box].append(stats)
-
-        # Select box based on weights (lower boxes preferred)
-        selected_stats = self._weighted_box_selection(by_box)
+        # Select based on box weights (lower boxes preferred)
+        selected_stats = self._weighted_box_selection(available_stats)
 
         if not selected_stats:
             return None
@@ -195,50 +290,39 @@ class SpacedRepetition:
         # Reconstruct the question from the ID
         return self._reconstruct_question(selected_stats.question_id)
 
-    def _weighted_box_selection(
-        self, by_box: dict[int, list[QuestionStats]]
-    ) -> QuestionStats | None:
+    def _weighted_box_selection(self, candidates: list[QuestionStats]) -> QuestionStats | None:
         """
         Select a question using weighted random selection across boxes.
 
-        Lower boxes have higher probability of being selected.
+        Lower boxes have higher probability of being selected. Each
+        candidate is weighted by its box directly, so there is no need to
+        group the candidates by box first.
         """
-        candidates: list[tuple[QuestionStats, float]] = []
-
-        for box_num, stats_list in by_box.items():
-            weight = BOX_WEIGHTS.get(box_num, 0.1)
-            for stats in stats_list:
-                # Apply weight and add some time-based priority
-                final_weight = weight * self._time_factor(stats)
-                candidates.append((stats, final_weight))
+        now = self._request_time()
+        # Apply the box weight and add some time-based priority
+        weights = [
+            BOX_WEIGHTS.get(stats.box, 0.1) * self._time_factor(stats, now) for stats in candidates
+        ]
 
         if not candidates:
             return None
 
         # Weighted random selection
-        total_weight = sum(w for _, w in candidates)
-        if total_weight == 0:
-            return random.choice([s for s, _ in candidates])
-
-        r = random.random() * total_weight
-        cumulative = 0.0
-        for stats, weight in candidates:
-            cumulative += weight
-            if r <= cumulative:
-                return stats
+        if sum(weights) == 0:
+            return random.choice(candidates)
+        return random.choices(candidates, weights=weights)[0]
 
-        return candidates[-1][0]  # Fallback
-
-    def _time_factor(self, stats: QuestionStats) -> float:
+    def _time_factor(self, stats: QuestionStats, now: float | None = None) -> float:
         """
         Calculate a time-based priority factor.
 
-        Questions not asked recently get a slight boost.
+        Questions not asked recently get a slight boost. Pass ``now`` when
+        scoring many questions to read the clock once.
         """
         if stats.last_asked is None:
             return 1.5  # Boost never-asked questions
 
-        hours_since = (datetime.now() - stats.last_asked).total_seconds() / 3600
+        hours_since = ((now or self._request_time()) - stats.last_asked) / 3600
 
         # Logarithmic boost based on hours since last asked
         if hours_since < 1:
@@ -248,15 +332,15 @@ class SpacedRepetition:
         else:
             return min(2.0, 1.0 + (hours_since / 168))  # Up to 2x after a week
 
-    def _generate_new_question(self) -> MathQuestion:
+    def _generate_new_question(self, exclude: Collection[str] = ()) -> MathQuestion:
         """Generate a new question that hasn't been seen or was seen long ago."""
         max_attempts = 20
 
         for _ in range(max_attempts):
             question = generate_question(grade=self._grade)
 
-            # Skip if recently asked
-            if question.question_id in self._recent_questions:
+            # Skip if recently asked or excluded by the caller
+            if question.question_id in self._recent_set or question.question_id in exclude:
                 continue
 
             # Prefer truly new questions
@@ -278,66 +362,19 @@ class SpacedRepetition:
         Question ID format: "{operation}_{operand1}_{operand2}"
         e.g., "add_7_5", "mul_6_8"
         """
-        try:
-            parts = question_id.split("_")
-            if len(parts) != 3:
-                return None
-
-            op_str, op1_str, op2_str = parts
-            operand1 = int(op1_str)
-            operand2 = int(op2_str)
-
-            # Map operation string to enum
-            op_map = {
-                "add": Operation.ADDITION,
-                "sub": Operation.SUBTRACTION,
-                "mul": Operation.MULTIPLICATION,
-                "div": Operation.DIVISION,
-            }
-            operation = op_map.get(op_str)
-            if operation is None:
-                return None
-
-            # Calculate the correct answer
-            if operation == Operation.ADDITION:
-                answer = operand1 + operand2
-            elif operation == Operation.SUBTRACTION:
-                answer = operand1 - operand2
-            elif operation == Operation.MULTIPLICATION:
-                answer = operand1 * operand2
-            elif operation == Operation.DIVISION:
-                answer = operand1 // operand2 if operand2 != 0 else 0
-            else:
-                return None
-
-            # German operation words
-            op_words = {
-                Operation.ADDITION: "plus",
-                Operation.SUBTRACTION: "minus",
-                Operation.MULTIPLICATION: "mal",
-                Operation.DIVISION: "geteilt durch",
-            }
-
-            question_text = f"Was ist {operand1} {op_words[operation]} {operand2}?"
-
-            return MathQuestion(
-                question_id=question_id,
-                operand1=operand1,
-                operand2=operand2,
-                operation=operation,
-                correct_answer=answer,
-                question_text_german=question_text,
-            )
-        except (ValueError, IndexError):
-            return None
+        return _reconstruct_question(question_id)
 
-    def record_answer(self, question_id: str, correct: bool) -> None:
+    def record_answer(
+        self, question_id: str, correct: bool, answered_at: float | None = None
+    ) -> None:
         """
         Update SRS data after an answer is given.
 
         Args:
             question_id: The ID of the question answered.
             correct: Whether the answer was correct.
+            answered_at: When the answer was given (Unix seconds), for answers
+                        recorded later than they were given. Defaults to now.
         """
         # Get or create stats for this question
         if question_id not in self._stats:
@@ -355,13 +392,63 @@ class SpacedRepetition:
             # Move back to box 1
             stats.box = MIN_BOX
 
-        stats.last_asked = datetime.now()
+        stats.last_asked = self._request_time() if answered_at is None else answered_at
+        self._changed.add(question_id)
+        if self._op_totals is not None:
+            self._count_answer(self._op_totals, question_id, stats, correct)
 
         # Track in session and recent questions
         self._session_asked.add(question_id)
-        self._recent_questions.append(question_id)
-        if len(self._recent_questions) > self._max_recent:
-            self._recent_questions.pop(0)
+        recent = self._recent_questions
+        if len(recent) == self._max_recent:
+            oldest = recent.popleft()
+            if oldest not in recent:
+                self._recent_set.discard(oldest)
+        recent.append(question_id)
+        self._recent_set.add(question_id)
+
+    def _build_op_totals(self) -> dict[str, list[int]]:
+        """Sum correct answers and attempts per operation from all stats (once)."""
+        if self._op_totals is None:
+            self._op_totals = {}
+            self._strong_op_totals = {}
+            for question_id, stats in self._stats.items():
+                if stats.total_attempts == 0:
+                    continue
+                op_type = question_id.split("_", 1)[0]
+                self._add_to_totals(
+                    self._op_totals, op_type, stats.correct_count, stats.total_attempts
+                )
+                if stats.total_attempts >= STRONG_AREA_MIN_ATTEMPTS:
+                    self._add_to_totals(
+                        self._strong_op_totals, op_type, stats.correct_count, stats.total_attempts
+                    )
+        return self._op_totals
+
+    def _count_answer(
+        self, op_totals: dict[str, list[int]], question_id: str, stats: QuestionStats, correct: bool
+    ) -> None:
+        """Fold one answer (already recorded in stats) into the built per-operation totals."""
+        op_type = question_id.split("_", 1)[0]
+        self._add_to_totals(op_totals, op_type, int(correct), 1)
+
+        attempts = stats.total_attempts
+        if attempts == STRONG_AREA_MIN_ATTEMPTS:
+            # The question just became eligible, so its whole history counts
+            self._add_to_totals(self._strong_op_totals, op_type, stats.correct_count, attempts)
+        elif attempts > STRONG_AREA_MIN_ATTEMPTS:
+            self._add_to_totals(self._strong_op_totals, op_type, int(correct), 1)
+
+    @staticmethod
+    def _add_to_totals(
+        totals: dict[str, list[int]], op_type: str, correct: int, attempts: int
+    ) -> None:
+        entry = totals.get(op_type)
+        if entry is None:
+            totals[op_type] = [correct, attempts]
+        else:
+            entry[0] += correct
+            entry[1] += attempts
 
     def get_weak_areas(self) -> list[str]:
         """
@@ -371,26 +458,12 @@ class SpacedRepetition:
             List of operation names (e.g., ["subtraction", "division"])
             sorted by difficulty (most challenging first).
         """
-        # Group stats by operation type
-        op_stats: dict[str, list[QuestionStats]] = defaultdict(list)
-
-        for question_id, stats in self._stats.items():
-            if stats.total_attempts == 0:
-                continue
-
-            # Extract operation from question_id
-            parts = question_id.split("_")
-            if parts:
-                op_type = parts[0]
-                op_stats[op_type].append(stats)
-
-        # Calculate average accuracy per operation
-        op_accuracy: dict[str, float] = {}
-        for op_type, stats_list in op_stats.items():
-            total_correct = sum(s.correct_count for s in stats_list)
-            total_attempts = sum(s.total_attempts for s in stats_list)
-            if total_attempts > 0:
-                op_accuracy[op_type] = total_correct / total_attempts
+        # Average accuracy per operation
+        op_accuracy = {
+            op_type: correct / attempts
+            for op_type, (correct, attempts) in self._build_op_totals().items()
+            if attempts > 0
+        }
 
         # Map to readable names and filter weak areas (< 70% accuracy)
         op_names = {
@@ -415,23 +488,13 @@ class SpacedRepetition:
         Returns:
             List of operation names with >= 80% accuracy.
         """
-        op_stats: dict[str, list[QuestionStats]] = defaultdict(list)
-
-        for question_id, stats in self._stats.items():
-            if stats.total_attempts < 3:  # Need at least 3 attempts
-                continue
-
-            parts = question_id.split("_")
-            if parts:
-                op_type = parts[0]
-                op_stats[op_type].append(stats)
-
-        op_accuracy: dict[str, float] = {}
-        for op_type, stats_list in op_stats.items():
-            total_correct = sum(s.correct_count for s in stats_list)
-            total_attempts = sum(s.total_attempts for s in stats_list)
-            if total_attempts > 0:
-                op_accuracy[op_type] = total_correct / total_attempts
+        # Only questions with at least STRONG_AREA_MIN_ATTEMPTS attempts count
+        self._build_op_totals()
+        op_accuracy = {
+            op_type: correct / attempts
+            for op_type, (correct, attempts) in self._strong_op_totals.items()
+            if attempts > 0
+        }
 
         op_names = {
             "add": "Plus-Aufgaben",
@@ -464,6 +527,8 @@ class SpacedRepetition:
         """Reset session-specific tracking (for new session)."""
         self._session_asked.clear()
         self._recent_questions.clear()
+        self._recent_set.clear()
+        self._now = None
 
     def load_stats(self, stats_data: list[dict]) -> None:
         """
@@ -473,6 +538,7 @@ class SpacedRepetition:
             stats_data: List of QuestionStats dictionaries.
         """
         self._stats.clear()
+        self._op_totals = None
         for data in stats_data:
             stats = QuestionStats.from_dict(data)
             self._stats[stats.question_id] = stats
@@ -3,35 +3,15 @@ German Math Quiz Alexa Skill - Lambda Function.
 
 This module configures and exports the Alexa skill lambda handler.
 All request handlers are defined in alexa.handlers.
+
+The skill (DynamoDB resource, persistence adapter, handlers and
+interceptors) is built on first use rather than at import time, so a
+cold start only pays for it once a request actually needs the skill.
 """
 
 import logging
 import os
-
-from ask_sdk_core.skill_builder import CustomSkillBuilder
-from ask_sdk_dynamodb.adapter import DynamoDbAdapter
-
-from alexa.handlers import (
-    AnswerIntentHandler,
-    ExitIntentHandler,
-    FallbackIntentHandler,
-    HelpIntentHandler,
-    IntentReflectorHandler,
-    LaunchRequestHandler,
-    ProgressHandler,
-    QuizHandler,
-    RepeatHandler,
-    SelectPlayerHandler,
-    SessionEndedRequestHandler,
-    SetDifficultyHandler,
-    SetupGradeHandler,
-)
-from alexa.interceptors import (
-    CacheResponseForRepeatInterceptor,
-    CatchAllExceptionHandler,
-    RequestLogger,
-    ResponseLogger,
-)
+from functools import cache
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -40,39 +20,93 @@ logger.setLevel(logging.INFO)
 # DynamoDB table name for persistence (configurable via environment variable)
 DYNAMODB_TABLE_NAME = os.environ.get("DYNAMODB_TABLE_NAME", "MathQuizUserData")
 
-# Persistence adapter for storing user data in DynamoDB
-persistence_adapter = DynamoDbAdapter(
-    table_name=DYNAMODB_TABLE_NAME,
-    partition_key_name="id",
-    attribute_name="attributes",
-    create_table=False,
-)
-
-# Skill Builder with persistence adapter
-sb = CustomSkillBuilder(persistence_adapter=persistence_adapter)
-
-# Add request handlers (order matters - more specific handlers first)
-sb.add_request_handler(LaunchRequestHandler())
-sb.add_request_handler(SelectPlayerHandler())
-sb.add_request_handler(SetupGradeHandler())
-sb.add_request_handler(QuizHandler())
-sb.add_request_handler(AnswerIntentHandler())
-sb.add_request_handler(SetDifficultyHandler())
-sb.add_request_handler(ProgressHandler())
-sb.add_request_handler(RepeatHandler())
-sb.add_request_handler(HelpIntentHandler())
-sb.add_request_handler(ExitIntentHandler())
-sb.add_request_handler(SessionEndedRequestHandler())
-sb.add_request_handler(FallbackIntentHandler())
-sb.add_request_handler(IntentReflectorHandler())  # Must be last - catches any unhandled intents
-
-# Add exception handler
-sb.add_exception_handler(CatchAllExceptionHandler())
-
-# Add interceptors
-sb.add_global_response_interceptor(CacheResponseForRepeatInterceptor())
-sb.add_global_request_interceptor(RequestLogger())
-sb.add_global_response_interceptor(ResponseLogger())
-
-# Expose the lambda handler
-lambda_handler = sb.lambda_handler()
+
+@cache
+def _build_skill_handler():
+    """Build the skill once per container and return its Lambda handler."""
+    import boto3  # type: ignore[import-untyped]
+    from ask_sdk_core.skill_builder import CustomSkillBuilder
+    from ask_sdk_dynamodb.adapter import DynamoDbAdapter
+    from botocore.config import Config  # type: ignore[import-untyped]
+
+    from alexa.handlers import (
+        AnswerIntentHandler,
+        ExitIntentHandler,
+        FallbackIntentHandler,
+        HelpIntentHandler,
+        IntentReflectorHandler,
+        LaunchRequestHandler,
+        ProgressHandler,
+        QuizHandler,
+        RepeatHandler,
+        SelectPlayerHandler,
+        SessionEndedRequestHandler,
+        SetDifficultyHandler,
+        SetupGradeHandler,
+    )
+    from alexa.interceptors import (
+        CacheResponseForRepeatInterceptor,
+        CatchAllExceptionHandler,
+        FlushPendingAnswersInterceptor,
+        RequestLogger,
+        ResponseLogger,
+    )
+
+    # DynamoDB resource created once per container and reused by warm invocations.
+    # Keep-alive avoids a new TLS handshake per request; standard-mode retries with
+    # a low attempt count keep a slow request within Alexa's response deadline.
+    dynamodb_resource = boto3.resource(
+        "dynamodb",
+        config=Config(tcp_keepalive=True, retries={"max_attempts": 2, "mode": "standard"}),
+    )
+
+    # Persistence adapter for storing user data in DynamoDB
+    persistence_adapter = DynamoDbAdapter(
+        table_name=DYNAMODB_TABLE_NAME,
+        partition_key_name="id",
+        attribute_name="attributes",
+        create_table=False,
+        dynamodb_resource=dynamodb_resource,
+    )
+
+    # Skill Builder with persistence adapter
+    sb = CustomSkillBuilder(persistence_adapter=persistence_adapter)
+
+    # Add request handlers (order matters - more specific handlers first)
+    sb.add_request_handler(LaunchRequestHandler())
+    sb.add_request_handler(SelectPlayerHandler())
+    sb.add_request_handler(SetupGradeHandler())
+    sb.add_request_handler(QuizHandler())
+    sb.add_request_handler(AnswerIntentHandler())
+    sb.add_request_handler(SetDifficultyHandler())
+    sb.add_request_handler(ProgressHandler())
+    sb.add_request_handler(RepeatHandler())
+    sb.add_request_handler(HelpIntentHandler())
+    sb.add_request_handler(ExitIntentHandler())
+    sb.add_request_handler(SessionEndedRequestHandler())
+    sb.add_request_handler(FallbackIntentHandler())
+    sb.add_request_handler(IntentReflectorHandler())  # Must be last - catches any unhandled intents
+
+    # Add exception handler
+    sb.add_exception_handler(CatchAllExceptionHandler())
+
+    # Add interceptors
+    sb.add_global_response_interceptor(CacheResponseForRepeatInterceptor())
+    sb.add_global_request_interceptor(RequestLogger())
+    sb.add_global_request_interceptor(FlushPendingAnswersInterceptor())
+    sb.add_global_response_interceptor(ResponseLogger())
+
+    return sb.lambda_handler()
+
+
+def lambda_handler(event, context):
+    """
+    Lambda entry point.
+
+    Scheduled keep-warm pings build the skill (so the next real request
+    finds it ready) but do not run it.
+    """
+    skill_handler = _build_skill_handler()
+    if event.get("source") == "aws.events":
+        return {}
+    return skill_handler(event, context)
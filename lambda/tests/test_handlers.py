@@ -5,9 +5,25 @@ These tests verify the behavior of all intent handlers for the
 German Math Quiz skill.
 """
 
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
+from ask_sdk_model import (
+    Intent,
+    IntentRequest,
+    LaunchRequest,
+    SessionEndedReason,
+    SessionEndedRequest,
+    Slot,
+)
+from ask_sdk_model.slu.entityresolution import (
+    Resolution,
+    Resolutions,
+    Status,
+    StatusCode,
+    Value,
+    ValueWrapper,
+)
 
 from alexa import data
 from alexa.handlers import (
@@ -19,14 +35,24 @@ from alexa.handlers import (
     ProgressHandler,
     QuizHandler,
     RepeatHandler,
+    SessionEndedRequestHandler,
     SetDifficultyHandler,
 )
 from alexa.handlers.helpers import (
+    build_static_response,
+    compile_template,
+    flush_pending_answers,
     get_correct_feedback,
+    get_current_question,
+    get_current_question_text,
     get_incorrect_feedback,
     get_quiz_end_message,
+    get_srs_from_session,
+    invalidate_srs_cache,
     serialize_question,
 )
+from alexa.handlers.setup import _extract_grade
+from alexa.interceptors import CacheResponseForRepeatInterceptor, FlushPendingAnswersInterceptor
 from alexa.math_questions import MathQuestion, Operation
 from alexa.models import UserProfile
 
@@ -43,6 +69,7 @@ def mock_handler_input():
     # Session attributes (mutable dict)
     session_attrs = {}
     handler_input.attributes_manager.session_attributes = session_attrs
+    handler_input.attributes_manager.request_attributes = {}
 
     # Response builder
     response_builder = MagicMock()
@@ -104,7 +131,7 @@ class TestHelperFunctions:
 
     def test_get_correct_feedback(self):
         """Test that correct feedback contains the answer or is a positive affirmation."""
-        feedback = get_correct_feedback(42)
+        feedback = get_correct_feedback("add_40_2", 42)
         feedback_lower = feedback.lower()
         # Should either contain the answer or be a positive affirmation
         positive_words = [
@@ -123,11 +150,31 @@ class TestHelperFunctions:
             f"Feedback should contain positive words: {feedback}"
         )
 
+    def test_compile_template_matches_str_format(self):
+        """Test that compiled templates render exactly like str.format."""
+        for template in data.WRONG_ANSWER_TEMPLATES:
+            render = compile_template(template)
+            fields = {"operand1": 7, "operand2": 5, "operation": "plus", "answer": 12}
+            assert render(**fields) == template.format(**fields)
+
     def test_get_incorrect_feedback(self):
         """Test that incorrect feedback contains the correct answer."""
-        feedback = get_incorrect_feedback(7, 5, "add", 12)
+        feedback = get_incorrect_feedback("add_7_5", 7, 5, "add", 12)
         assert "12" in feedback
 
+    def test_get_incorrect_feedback_with_operation_index(self):
+        """Test that the stored operation index maps to the German operation word."""
+        feedback = get_incorrect_feedback("mul_3_4", 3, 4, data.OPERATION_CODES.index("mul"), 12)
+        assert feedback == get_incorrect_feedback("mul_3_4", 3, 4, "mul", 12)
+        assert "mal" in feedback
+
+    def test_feedback_template_is_stable_per_question(self):
+        """Test that the same question always gets the same feedback."""
+        assert get_correct_feedback("add_7_5", 12) == get_correct_feedback("add_7_5", 12)
+        assert get_incorrect_feedback("add_7_5", 7, 5, "add", 12) == (
+            get_incorrect_feedback("add_7_5", 7, 5, "add", 12)
+        )
+
     def test_get_quiz_end_message_perfect(self):
         """Test quiz end message for perfect score."""
         message = get_quiz_end_message(10, 10)
@@ -148,16 +195,160 @@ class TestHelperFunctions:
         message = get_quiz_end_message(3, 10)
         assert "übung" in message.lower()
 
+    def test_get_quiz_end_message_thresholds_for_any_length(self):
+        """Test that integer thresholds match the 80%/50% rule for short quizzes too."""
+        for total in range(1, 13):
+            for correct in range(total):
+                if correct >= total * 0.8:
+                    expected = data.QUIZ_END_GREAT
+                elif correct >= total * 0.5:
+                    expected = data.QUIZ_END_GOOD
+                else:
+                    expected = data.QUIZ_END_KEEP_PRACTICING
+                assert get_quiz_end_message(correct, total) == expected.format(
+                    correct=correct, total=total
+                )
+
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_get_srs_from_session_builds_from_persistence_per_request(
+        self, mock_get_pm, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that every request builds its SRS from the persistence layer."""
+        mock_get_pm.return_value = mock_persistence_manager
+
+        first = get_srs_from_session(mock_handler_input)
+        assert first.grade == 2
+
+        mock_handler_input.attributes_manager.request_attributes = {}
+        second = get_srs_from_session(mock_handler_input)
+
+        assert second is not first
+        assert mock_persistence_manager.get_question_stats.call_count == 2
+
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_flush_pending_answers_reads_fresh_stats(
+        self, mock_get_pm, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that answers are applied to stats loaded after the item was read again."""
+        mock_get_pm.return_value = mock_persistence_manager
+        request_attr = mock_handler_input.attributes_manager.request_attributes
+        stale = request_attr["srs"] = MagicMock()
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["pending_answers"] = [["add_7_5", 1, 1700000000.0]]
+
+        flush_pending_answers(mock_handler_input)
+
+        calls = [name for name, _, _ in mock_persistence_manager.mock_calls]
+        assert calls.index("begin_change") < calls.index("get_question_stats")
+        stale.record_answer.assert_not_called()
+        assert request_attr["srs"].question_stats["add_7_5"].correct_count == 1
+
+    @patch("alexa.handlers.helpers.get_srs_from_session")
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_flush_pending_answers_writes_once(
+        self, mock_get_pm, mock_get_srs, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that buffered answers are applied in order and committed together."""
+        mock_get_pm.return_value = mock_persistence_manager
+        srs = MagicMock()
+        srs.pop_changed_stats.return_value = {}
+        mock_get_srs.return_value = srs
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["pending_answers"] = [
+            ["add_7_5", 1, 1700000000.0],
+            ["sub_9_4", 0, 1700000010.0],
+        ]
+
+        flush_pending_answers(mock_handler_input)
+
+        assert [c.args for c in srs.record_answer.call_args_list] == [
+            ("add_7_5", True, 1700000000.0),
+            ("sub_9_4", False, 1700000010.0),
+        ]
+        assert mock_persistence_manager.update_session_stats.call_args_list[1].kwargs == {
+            "questions_answered": 1,
+            "correct_answers": 0,
+            "reset_streak": True,
+        }
+        mock_persistence_manager.transaction.assert_called_once()
+        assert "pending_answers" not in session_attr
+
+    @patch("alexa.handlers.helpers.get_srs_from_session")
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_flush_pending_answers_without_answer_time(
+        self, mock_get_pm, mock_get_srs, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that answers buffered without a time are recorded at flush time."""
+        mock_get_pm.return_value = mock_persistence_manager
+        srs = MagicMock()
+        srs.pop_changed_stats.return_value = {}
+        mock_get_srs.return_value = srs
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["pending_answers"] = [["add_7_5", 1]]
+
+        flush_pending_answers(mock_handler_input)
+
+        srs.record_answer.assert_called_once_with("add_7_5", True)
+
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_flush_pending_answers_keeps_answers_on_error(
+        self, mock_get_pm, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that answers stay buffered when the write fails."""
+        # The write happens when the transaction block exits
+        transaction = mock_persistence_manager.transaction.return_value
+        transaction.__exit__.side_effect = RuntimeError("DynamoDB unavailable")
+        mock_get_pm.return_value = mock_persistence_manager
+        invalidate_srs_cache(mock_handler_input)
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["pending_answers"] = [["add_7_5", 1]]
+
+        with pytest.raises(RuntimeError):
+            flush_pending_answers(mock_handler_input)
+
+        assert session_attr["pending_answers"] == [["add_7_5", 1]]
+
+    @patch("alexa.handlers.helpers.get_persistence_manager")
+    def test_get_srs_from_session_shares_instance_within_request(
+        self, mock_get_pm, mock_handler_input, mock_persistence_manager
+    ):
+        """Test that one request reuses its SRS until it is invalidated."""
+        mock_get_pm.return_value = mock_persistence_manager
+
+        first = get_srs_from_session(mock_handler_input)
+
+        assert get_srs_from_session(mock_handler_input) is first
+        invalidate_srs_cache(mock_handler_input)
+        assert get_srs_from_session(mock_handler_input) is not first
+
     def test_serialize_question(self, sample_question):
         """Test question serialization for session storage."""
         serialized = serialize_question(sample_question)
 
-        assert serialized["question_id"] == "add_7_5"
-        assert serialized["operand1"] == 7
-        assert serialized["operand2"] == 5
-        assert serialized["operation"] == "add"
-        assert serialized["correct_answer"] == 12
-        assert serialized["question_text_german"] == "Was ist 7 plus 5?"
+        assert serialized == ["add_7_5", 7, 5, 0, 12, "Was ist 7 plus 5?"]
+
+    def test_get_current_question_from_compact_form(self, sample_question):
+        """Test the dict view of a compactly stored question."""
+        session_attr = {"current_question": serialize_question(sample_question)}
+
+        current_q = get_current_question(session_attr)
+
+        assert current_q["question_id"] == "add_7_5"
+        assert current_q["operand1"] == 7
+        assert current_q["operand2"] == 5
+        assert current_q["operation"] == 0
+        assert current_q["correct_answer"] == 12
+        assert current_q["question_text_german"] == "Was ist 7 plus 5?"
+        assert get_current_question_text(session_attr) == "Was ist 7 plus 5?"
+
+    def test_get_current_question_accepts_legacy_dict(self):
+        """Test that sessions holding the older dict form still work."""
+        session_attr = {"current_question": {"question_text_german": "Was ist 7 plus 5?"}}
+
+        assert get_current_question(session_attr)["question_text_german"] == "Was ist 7 plus 5?"
+        assert get_current_question_text(session_attr) == "Was ist 7 plus 5?"
+        assert get_current_question({}) == {}
+        assert get_current_question_text({}) == ""
 
 
 # ============================================================================
@@ -170,12 +361,10 @@ class TestLaunchRequestHandler:
 
     def test_can_handle_launch_request(self, mock_handler_input):
         """Test that handler can handle LaunchRequest."""
-        mock_handler_input.request_envelope.request.object_type = "LaunchRequest"
+        mock_handler_input.request_envelope.request = LaunchRequest()
 
-        with patch("alexa.handlers.launch.is_request_type") as mock_is_request:
-            mock_is_request.return_value = lambda x: True
-            handler = LaunchRequestHandler()
-            assert handler.can_handle(mock_handler_input)
+        handler = LaunchRequestHandler()
+        assert handler.can_handle(mock_handler_input)
 
     def test_handle_asks_who_is_playing(self, mock_handler_input):
         """Test launch always asks who is playing."""
@@ -204,19 +393,18 @@ class TestQuizHandler:
 
     def test_can_handle_quiz_intent(self, mock_handler_input):
         """Test that handler can handle QuizIntent."""
-        with patch("alexa.handlers.quiz.is_intent_name") as mock_is_intent:
-            mock_is_intent.return_value = lambda x: True
-            handler = QuizHandler()
-            assert handler.can_handle(mock_handler_input)
+        mock_handler_input.request_envelope.request = IntentRequest(
+            intent=Intent(name="QuizIntent")
+        )
+
+        handler = QuizHandler()
+        assert handler.can_handle(mock_handler_input)
 
     @patch("alexa.handlers.quiz.get_srs_from_session")
-    @patch("alexa.handlers.quiz.get_persistence_manager")
-    def test_handle_starts_quiz(
-        self, mock_get_pm, mock_get_srs, mock_handler_input, sample_question
-    ):
+    def test_handle_starts_quiz(self, mock_get_srs, mock_handler_input, sample_question):
         """Test that quiz handler initializes quiz state correctly."""
         srs = MagicMock()
-        srs.get_next_question.return_value = sample_question
+        srs.get_next_questions.return_value = [sample_question] * data.MAX_QUESTIONS
         mock_get_srs.return_value = srs
 
         handler = QuizHandler()
@@ -229,6 +417,8 @@ class TestQuizHandler:
         assert session_attr["questions_asked"] == 1
         assert session_attr["correct_count"] == 0
         assert "current_question" in session_attr
+        assert len(session_attr["planned_questions"]) == data.MAX_QUESTIONS - 1
+        srs.get_next_questions.assert_called_once_with(data.MAX_QUESTIONS, exclude=set())
 
         # Check speech includes question
         speak_call = mock_handler_input.response_builder.speak.call_args
@@ -247,36 +437,31 @@ class TestAnswerIntentHandler:
     def test_can_handle_answer_during_quiz(self, mock_handler_input):
         """Test that handler only handles answers during quiz state."""
         mock_handler_input.attributes_manager.session_attributes["state"] = data.STATE_QUIZ
+        mock_handler_input.request_envelope.request = IntentRequest(
+            intent=Intent(name="AnswerIntent")
+        )
 
-        with patch("alexa.handlers.quiz.is_intent_name") as mock_is_intent:
-            mock_is_intent.return_value = lambda x: True
-            handler = AnswerIntentHandler()
-            assert handler.can_handle(mock_handler_input)
+        handler = AnswerIntentHandler()
+        assert handler.can_handle(mock_handler_input)
 
     def test_cannot_handle_answer_outside_quiz(self, mock_handler_input):
         """Test that handler doesn't handle answers outside quiz."""
         mock_handler_input.attributes_manager.session_attributes["state"] = data.STATE_NONE
+        mock_handler_input.request_envelope.request = IntentRequest(
+            intent=Intent(name="AnswerIntent")
+        )
 
-        with patch("alexa.handlers.quiz.is_intent_name") as mock_is_intent:
-            mock_is_intent.return_value = lambda x: True
-            handler = AnswerIntentHandler()
-            assert not handler.can_handle(mock_handler_input)
+        handler = AnswerIntentHandler()
+        assert not handler.can_handle(mock_handler_input)
 
-    @patch("alexa.handlers.quiz.save_srs_state")
     @patch("alexa.handlers.quiz.get_srs_from_session")
-    @patch("alexa.handlers.quiz.get_persistence_manager")
     def test_handle_correct_answer(
         self,
-        mock_get_pm,
         mock_get_srs,
-        mock_save_srs,
         mock_handler_input,
-        mock_persistence_manager,
         sample_question,
     ):
         """Test handling a correct answer."""
-        mock_get_pm.return_value = mock_persistence_manager
-
         srs = MagicMock()
         srs.get_next_question.return_value = sample_question
         srs.question_stats = {}
@@ -303,8 +488,9 @@ class TestAnswerIntentHandler:
         handler = AnswerIntentHandler()
         handler.handle(mock_handler_input)
 
-        # Check SRS was updated
-        srs.record_answer.assert_called_once_with("add_7_5", True)
+        # Check the answer was buffered in session, not written yet
+        srs.record_answer.assert_not_called()
+        assert session_attr["pending_answers"] == [["add_7_5", 1, ANY]]
 
         # Check correct count increased
         assert session_attr["correct_count"] == 1
@@ -317,21 +503,45 @@ class TestAnswerIntentHandler:
             f"Expected positive feedback in: {speech}"
         )
 
-    @patch("alexa.handlers.quiz.save_srs_state")
     @patch("alexa.handlers.quiz.get_srs_from_session")
-    @patch("alexa.handlers.quiz.get_persistence_manager")
+    def test_handle_answer_serves_planned_question(
+        self,
+        mock_get_srs,
+        mock_handler_input,
+    ):
+        """Test that the next question comes from the plan without asking the SRS."""
+        srs = MagicMock()
+        srs.question_stats = {}
+        mock_get_srs.return_value = srs
+
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_QUIZ
+        session_attr["current_question"] = ["add_7_5", 7, 5, "add", 12, "Was ist 7 plus 5?"]
+        session_attr["planned_questions"] = [["sub_9_4", 9, 4, "sub", 5, "Was ist 9 minus 4?"]]
+        session_attr["questions_asked"] = 1
+        session_attr["correct_count"] = 0
+        session_attr["session_questions"] = ["add_7_5"]
+
+        mock_handler_input.request_envelope.request.intent.slots = {"number": MagicMock(value="12")}
+
+        handler = AnswerIntentHandler()
+        handler.handle(mock_handler_input)
+
+        mock_get_srs.assert_not_called()
+        assert session_attr["current_question"][0] == "sub_9_4"
+        assert session_attr["planned_questions"] == []
+        assert session_attr["session_questions"] == ["add_7_5", "sub_9_4"]
+        speech = mock_handler_input.response_builder.speak.call_args[0][0]
+        assert "9 minus 4" in speech
+
+    @patch("alexa.handlers.quiz.get_srs_from_session")
     def test_handle_incorrect_answer(
         self,
-        mock_get_pm,
         mock_get_srs,
-        mock_save_srs,
         mock_handler_input,
-        mock_persistence_manager,
         sample_question,
     ):
         """Test handling an incorrect answer."""
-        mock_get_pm.return_value = mock_persistence_manager
-
         srs = MagicMock()
         srs.get_next_question.return_value = sample_question
         srs.question_stats = {}
@@ -358,8 +568,8 @@ class TestAnswerIntentHandler:
         handler = AnswerIntentHandler()
         handler.handle(mock_handler_input)
 
-        # Check SRS was updated with incorrect
-        srs.record_answer.assert_called_once_with("add_7_5", False)
+        # Check the incorrect answer was buffered
+        assert session_attr["pending_answers"] == [["add_7_5", 0, ANY]]
 
         # Check correct count did NOT increase
         assert session_attr["correct_count"] == 0
@@ -369,15 +579,9 @@ class TestAnswerIntentHandler:
         speech = speak_call[0][0]
         assert "12" in speech
 
-    @patch("alexa.handlers.quiz.save_srs_state")
     @patch("alexa.handlers.quiz.get_srs_from_session")
-    @patch("alexa.handlers.quiz.get_persistence_manager")
-    def test_handle_invalid_answer(
-        self, mock_get_pm, mock_get_srs, mock_save_srs, mock_handler_input, mock_persistence_manager
-    ):
+    def test_handle_invalid_answer(self, mock_get_srs, mock_handler_input):
         """Test handling an invalid (non-numeric) answer."""
-        mock_get_pm.return_value = mock_persistence_manager
-
         # Setup session state
         session_attr = mock_handler_input.attributes_manager.session_attributes
         session_attr["state"] = data.STATE_QUIZ
@@ -402,6 +606,45 @@ class TestAnswerIntentHandler:
         speak_call = mock_handler_input.response_builder.speak.call_args
         speech = speak_call[0][0].lower()
         assert "zahl" in speech or "verstanden" in speech
+        assert "pending_answers" not in session_attr
+
+    def test_invalid_answer_reasks_compact_question(self, mock_handler_input):
+        """Test that an unusable answer re-asks the stored question text."""
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_QUIZ
+        session_attr["current_question"] = ["add_7_5", 7, 5, 0, 12, "Was ist 7 plus 5?"]
+        mock_handler_input.request_envelope.request.intent.slots = {"number": MagicMock(value="?")}
+
+        AnswerIntentHandler().handle(mock_handler_input)
+
+        speak = mock_handler_input.response_builder.speak
+        assert speak.call_args[0][0].endswith("Was ist 7 plus 5?")
+        speak.return_value.ask.assert_called_once_with("Was ist 7 plus 5?")
+        assert "pending_answers" not in session_attr
+
+    @patch("alexa.handlers.quiz.flush_pending_answers")
+    def test_last_answer_flushes_quiz(self, mock_flush, mock_handler_input):
+        """Test that the last answer of a quiz writes all buffered answers."""
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_QUIZ
+        session_attr["current_question"] = ["add_7_5", 7, 5, "add", 12, "Was ist 7 plus 5?"]
+        session_attr["pending_answers"] = [["sub_9_4", 1, 1700000000.0]]
+        session_attr["questions_asked"] = data.MAX_QUESTIONS
+        session_attr["correct_count"] = 1
+
+        mock_handler_input.request_envelope.request.intent.slots = {"number": MagicMock(value="12")}
+
+        handler = AnswerIntentHandler()
+        handler.handle(mock_handler_input)
+
+        mock_flush.assert_called_once_with(mock_handler_input)
+        assert session_attr["pending_answers"] == [
+            ["sub_9_4", 1, 1700000000.0],
+            ["add_7_5", 1, ANY],
+        ]
+        mock_handler_input.response_builder.speak.return_value.set_should_end_session.assert_called_once_with(
+            True
+        )
 
 
 # ============================================================================
@@ -497,8 +740,8 @@ class TestSetDifficultyHandler:
         handler.handle(mock_handler_input)
 
         # Check grade was updated
-        assert profile.grade == 3
-        pm.save_user_profile.assert_called()
+        pm.update_user_profile.assert_called_once_with(grade=3)
+        pm.commit.assert_called()
 
     @patch("alexa.handlers.settings.get_srs_from_session")
     @patch("alexa.handlers.settings.get_persistence_manager")
@@ -523,7 +766,7 @@ class TestSetDifficultyHandler:
         handler.handle(mock_handler_input)
 
         # Grade should decrease by 1
-        assert profile.grade == 2
+        pm.update_user_profile.assert_called_once_with(grade=2)
 
     @patch("alexa.handlers.settings.get_srs_from_session")
     @patch("alexa.handlers.settings.get_persistence_manager")
@@ -548,7 +791,26 @@ class TestSetDifficultyHandler:
         handler.handle(mock_handler_input)
 
         # Grade should increase by 1
-        assert profile.grade == 3
+        pm.update_user_profile.assert_called_once_with(grade=3)
+
+    @patch("alexa.handlers.settings.get_persistence_manager")
+    def test_harder_at_max_grade_skips_profile(self, mock_get_pm, mock_handler_input):
+        """Test that a no-op change uses the session grade and never touches the profile."""
+        pm = MagicMock()
+        mock_get_pm.return_value = pm
+
+        mock_handler_input.attributes_manager.session_attributes["grade"] = 4
+        mock_handler_input.request_envelope.request.intent.slots = {
+            "grade": MagicMock(value=None),
+            "direction": MagicMock(value="schwerer"),
+        }
+
+        handler = SetDifficultyHandler()
+        handler.handle(mock_handler_input)
+
+        pm.get_user_profile.assert_not_called()
+        pm.update_user_profile.assert_not_called()
+        pm.commit.assert_not_called()
 
 
 # ============================================================================
@@ -601,6 +863,15 @@ class TestHelpIntentHandler:
 class TestExitIntentHandler:
     """Tests for the ExitIntentHandler."""
 
+    @pytest.mark.parametrize(
+        "intent_name", ["AMAZON.CancelIntent", "AMAZON.StopIntent", "AMAZON.PauseIntent"]
+    )
+    def test_can_handle_exit_intents(self, mock_handler_input, intent_name):
+        """Test that cancel, stop and pause all end the skill."""
+        mock_handler_input.request_envelope.request = IntentRequest(intent=Intent(name=intent_name))
+
+        assert ExitIntentHandler().can_handle(mock_handler_input)
+
     def test_exit_during_quiz_shows_summary(self, mock_handler_input):
         """Test exit during quiz shows progress summary."""
         session_attr = mock_handler_input.attributes_manager.session_attributes
@@ -626,13 +897,29 @@ class TestExitIntentHandler:
         session_attr["state"] = data.STATE_NONE
 
         handler = ExitIntentHandler()
-        handler.handle(mock_handler_input)
+        response = handler.handle(mock_handler_input)
 
-        speak_call = mock_handler_input.response_builder.speak.call_args
-        speech = speak_call[0][0].lower()
+        speech = response.output_speech.ssml.lower()
 
-        # Should say goodbye
+        # Should say goodbye and end the session
         assert "tschüss" in speech or "bis" in speech
+        assert response.should_end_session is True
+
+
+class TestSessionEndedRequestHandler:
+    """Tests for the SessionEndedRequestHandler."""
+
+    def test_logs_only_the_reason(self, mock_handler_input, caplog):
+        """Test that the end-of-session log names the reason, not the whole envelope."""
+        mock_handler_input.request_envelope.request = SessionEndedRequest(
+            reason=SessionEndedReason.USER_INITIATED
+        )
+
+        with caplog.at_level("INFO", logger="alexa.handlers.standard"):
+            SessionEndedRequestHandler().handle(mock_handler_input)
+
+        assert "Session ended with reason: SessionEndedReason.USER_INITIATED" in caplog.text
+        assert "MagicMock" not in caplog.text
 
 
 # ============================================================================
@@ -660,6 +947,25 @@ class TestRepeatHandler:
         # Should repeat the question
         assert "7 plus 5" in speech
 
+    def test_repeat_outside_quiz_replays_cached_response(self, mock_handler_input):
+        """Test repeat outside quiz re-emits the speech of the cached response."""
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_NONE
+        session_attr["recent_response"] = {
+            "speech": "<speak>Hallo Emma!</speak>",
+            "reprompt": "<speak>Wie heißt du?</speak>",
+        }
+
+        handler = RepeatHandler()
+        handler.handle(mock_handler_input)
+
+        mock_handler_input.response_builder.speak.assert_called_once_with(
+            "<speak>Hallo Emma!</speak>"
+        )
+        mock_handler_input.response_builder.ask.assert_called_once_with(
+            "<speak>Wie heißt du?</speak>"
+        )
+
 
 # ============================================================================
 # Test Fallback Handler
@@ -692,15 +998,105 @@ class TestFallbackIntentHandler:
         session_attr["state"] = data.STATE_NONE
 
         handler = FallbackIntentHandler()
-        handler.handle(mock_handler_input)
+        response = handler.handle(mock_handler_input)
 
-        speak_call = mock_handler_input.response_builder.speak.call_args
-        speech = speak_call[0][0].lower()
+        speech = response.output_speech.ssml.lower()
 
         # Should mention not understood
         assert "verstanden" in speech or "hilfe" in speech
 
 
+# ============================================================================
+# Test Grade Slot Extraction
+# ============================================================================
+
+
+class TestExtractGrade:
+    """Tests for reading the grade from the SetGradeIntent slot."""
+
+    def test_prefers_entity_resolution_id(self):
+        """Test that the resolved canonical ID wins over the raw value."""
+        slot = Slot(
+            name="grade",
+            value="zweite",
+            resolutions=Resolutions(
+                resolutions_per_authority=[
+                    Resolution(
+                        authority="amzn1.er-authority.echo-sdk.grade",
+                        status=Status(code=StatusCode.ER_SUCCESS_MATCH),
+                        values=[ValueWrapper(value=Value(name="zweite", id="2"))],
+                    )
+                ]
+            ),
+        )
+        assert _extract_grade(slot) == 2
+
+    def test_falls_back_to_raw_value(self):
+        """Test that a numeric raw value is used without resolutions."""
+        assert _extract_grade(Slot(name="grade", value="3")) == 3
+        assert _extract_grade(Slot(name="grade", value="dritte")) is None
+        assert _extract_grade(None) is None
+
+
+# ============================================================================
+# Test Repeat Cache Interceptor
+# ============================================================================
+
+
+class TestCacheResponseForRepeatInterceptor:
+    """Tests for the CacheResponseForRepeatInterceptor."""
+
+    def test_caches_only_speech_and_reprompt(self, mock_handler_input):
+        """Test that only the speech texts of the response are kept in session."""
+        response = build_static_response("Hallo Emma!", "Wie heißt du?")
+
+        CacheResponseForRepeatInterceptor().process(mock_handler_input, response)
+
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        assert session_attr["recent_response"] == {
+            "speech": "<speak>Hallo Emma!</speak>",
+            "reprompt": "<speak>Wie heißt du?</speak>",
+        }
+
+    def test_skips_responses_that_end_the_session(self, mock_handler_input):
+        """Test that a goodbye response is not cached for repeating."""
+        response = build_static_response("Tschüss!")
+        response.should_end_session = True
+
+        CacheResponseForRepeatInterceptor().process(mock_handler_input, response)
+
+        assert "recent_response" not in mock_handler_input.attributes_manager.session_attributes
+
+
+class TestFlushPendingAnswersInterceptor:
+    """Tests for the FlushPendingAnswersInterceptor."""
+
+    @patch("alexa.interceptors.flush_pending_answers")
+    def test_flushes_before_non_answer_request(self, mock_flush, mock_handler_input):
+        """Test that leaving the quiz writes the buffered answers."""
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_NONE
+        session_attr["pending_answers"] = [["add_7_5", 1]]
+
+        FlushPendingAnswersInterceptor().process(mock_handler_input)
+
+        mock_flush.assert_called_once_with(mock_handler_input)
+
+    @patch("alexa.interceptors.flush_pending_answers")
+    def test_keeps_buffering_during_answers(self, mock_flush, mock_handler_input):
+        """Test that answer turns do not trigger a write."""
+        session_attr = mock_handler_input.attributes_manager.session_attributes
+        session_attr["state"] = data.STATE_QUIZ
+        session_attr["pending_answers"] = [["add_7_5", 1]]
+        mock_handler_input.request_envelope.request = IntentRequest(
+            intent=Intent(name="AnswerIntent")
+        )
+
+        FlushPendingAnswersInterceptor().process(mock_handler_input)
+
+        mock_flush.assert_not_called()
+
+
 # ============================================================================
 # Test Data Module
 # ============================================================================
@@ -1,5 +1,7 @@
 """Unit tests for the math question engine."""
 
+from dataclasses import FrozenInstanceError
+
 import pytest
 
 from alexa.math_questions import (
@@ -7,6 +9,7 @@ from alexa.math_questions import (
     DifficultyConfig,
     MathQuestion,
     Operation,
+    _pool_for,
     generate_question,
     generate_question_id,
     generate_question_set,
@@ -78,6 +81,12 @@ class TestMathQuestion:
         assert question.check_answer(7) is False
         assert question.check_answer(9) is False
 
+    def test_question_is_immutable(self):
+        """Test that questions cannot be modified (pooled instances are shared)."""
+        question = generate_question(grade=1)
+        with pytest.raises(FrozenInstanceError):
+            question.correct_answer = 0
+
 
 class TestGradeConfigs:
     """Tests for grade level configurations."""
@@ -86,7 +95,7 @@ class TestGradeConfigs:
         """Test grade 1 configuration."""
         config = GRADE_CONFIGS[1]
         assert config.grade == 1
-        assert config.operations == [Operation.ADDITION]
+        assert config.operations == (Operation.ADDITION,)
         assert Operation.SUBTRACTION not in config.operations
         assert Operation.MULTIPLICATION not in config.operations
         assert Operation.DIVISION not in config.operations
@@ -106,13 +115,13 @@ class TestGradeConfigs:
         """Test grade 3 configuration."""
         config = GRADE_CONFIGS[3]
         assert Operation.DIVISION in config.operations
-        assert config.multiplication_tables == list(range(1, 11))
+        assert config.multiplication_tables == tuple(range(1, 11))
 
     def test_grade_4_config(self):
         """Test grade 4 configuration."""
         config = GRADE_CONFIGS[4]
         assert config.number_range == (0, 1000)
-        assert config.multiplication_tables == list(range(1, 13))
+        assert config.multiplication_tables == tuple(range(1, 13))
 
 
 class TestGenerateQuestionAddition:
@@ -266,6 +275,17 @@ class TestGenerateQuestionSet:
         questions = generate_question_set(grade=1)
         assert len(questions) == 10
 
+    def test_mixed_operations_stay_within_grade(self):
+        """Test that a set without an operation draws from all of the grade's operations."""
+        questions = generate_question_set(count=200, grade=4)
+        assert len(questions) == 200
+        assert {q.operation for q in questions} == set(GRADE_CONFIGS[4].operations)
+
+    def test_invalid_grade_raises_error(self):
+        """Test error for an unsupported grade."""
+        with pytest.raises(ValueError):
+            generate_question_set(count=3, grade=99)
+
 
 class TestHelperFunctions:
     """Tests for helper functions."""
@@ -273,7 +293,7 @@ class TestHelperFunctions:
     def test_get_available_operations(self):
         """Test getting available operations for grade."""
         ops = get_available_operations(1)
-        assert ops == [Operation.ADDITION]
+        assert ops == (Operation.ADDITION,)
 
     def test_get_available_operations_invalid_grade(self):
         """Test error for invalid grade."""
@@ -310,3 +330,32 @@ class TestQuestionUniqueIds:
             question = generate_question(grade=1)
             expected_id = f"{question.operation.value}_{question.operand1}_{question.operand2}"
             assert question.question_id == expected_id
+
+
+class TestQuestionPools:
+    """Tests for the precomputed per-grade question pools."""
+
+    def test_pool_weights_form_a_distribution(self):
+        """Test that each pool's cumulative weights end at 1."""
+        for grade, config in GRADE_CONFIGS.items():
+            for operation in config.operations:
+                pool = _pool_for(grade, operation)
+                if pool is None:
+                    continue
+                questions, cum_weights = pool
+                assert len(questions) == len(cum_weights)
+                assert cum_weights[-1] == pytest.approx(1.0)
+
+    def test_pool_matches_generator_constraints(self):
+        """Test that pooled grade 2 subtraction questions stay in range and non-negative."""
+        questions, _ = _pool_for(2, Operation.SUBTRACTION)
+        for q in questions:
+            assert 1 <= q.operand2 <= q.operand1 <= 10
+            assert q.correct_answer == q.operand1 - q.operand2
+            assert q.question_id == generate_question_id(q.operation, q.operand1, q.operand2)
+
+    def test_large_question_space_uses_generator(self):
+        """Test that grade 4 addition is too large to pool and still generates questions."""
+        assert _pool_for(4, Operation.ADDITION) is None
+        question = generate_question(grade=4, operation=Operation.ADDITION)
+        assert question.operand1 + question.operand2 <= 1000
@@ -3,6 +3,7 @@ Unit tests for the data models.
 """
 
 from datetime import datetime
+from decimal import Decimal
 
 from alexa.models import QuestionStats, UserProfile
 
@@ -165,6 +166,19 @@ class TestQuestionStatsEdgeCases:
 
         assert stats.last_asked is None
 
+    def test_from_dict_reads_last_asked_as_unix_seconds(self):
+        """Should load last_asked as Unix seconds from numbers and legacy ISO strings."""
+        stored = QuestionStats.from_dict(
+            {"question_id": "add_5_3", "last_asked": Decimal(1700000000)}
+        )
+        legacy = QuestionStats.from_dict(
+            {"question_id": "add_5_3", "last_asked": "2025-12-01T10:00:00"}
+        )
+
+        assert stored.last_asked == 1700000000.0
+        assert legacy.last_asked == datetime(2025, 12, 1, 10, 0).timestamp()
+        assert QuestionStats.from_dict(stored.to_dict()).last_asked == stored.last_asked
+
     def test_from_dict_missing_optional_fields(self):
         """Should handle missing optional fields."""
         data = {"question_id": "sub_10_5"}
@@ -5,15 +5,25 @@ These tests use testcontainers with LocalStack to test against
 a real DynamoDB instance running in a container.
 """
 
+import copy
+import json
+from unittest.mock import MagicMock, patch
+
 import boto3
 import pytest
 from testcontainers.localstack import LocalStackContainer
 
+from alexa.handlers.helpers import flush_pending_answers
 from alexa.models import QuestionStats, UserProfile
 from alexa.persistence import (
+    _ATTRIBUTES_CACHE,
     ATTR_QUESTION_STATS,
     ATTR_SESSION_STATS,
     ATTR_USER_PROFILE,
+    ATTR_VERSION,
+    SESSION_ATTRIBUTES_VERSION,
+    SESSION_NO_PERSISTED_DATA,
+    LazyQuestionStats,
     PersistenceManager,
     get_persistence_manager,
     load_srs_data,
@@ -66,7 +76,8 @@ def dynamodb_resource(localstack_container):
 
 @pytest.fixture
 def dynamodb_table(dynamodb_resource):
-    """Get the DynamoDB table and clean it before each test."""
+    """Get the DynamoDB table and clean it (and the warm attributes cache) before each test."""
+    _ATTRIBUTES_CACHE.clear()
     table = dynamodb_resource.Table(TABLE_NAME)
 
     # Clean up all items before each test
@@ -90,6 +101,8 @@ class FakeAttributesManager:
         self._table = table
         self._user_id = user_id
         self._persistent_attributes: dict | None = None
+        self.session_attributes: dict = {}
+        self.request_attributes: dict = {}
 
     @property
     def persistent_attributes(self) -> dict:
@@ -337,8 +350,35 @@ class TestPersistenceManagerSaving:
         item = response.get("Item", {})
 
         assert ATTR_QUESTION_STATS in item
-        assert "add_3_2" in item[ATTR_QUESTION_STATS]
-        assert item[ATTR_QUESTION_STATS]["add_3_2"]["correct_count"] == 10
+        stats_data = json.loads(item[ATTR_QUESTION_STATS])
+        assert "add_3_2" in stats_data
+        assert stats_data["add_3_2"]["correct_count"] == 10
+
+    def test_question_stats_stored_without_repeated_id(self, handler_input, dynamodb_table):
+        """Stored entries omit question_id; it is restored from the key on load."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.save_question_stats({"add_3_2": QuestionStats(question_id="add_3_2", box=2)})
+
+        stored = json.loads(pm._get_player_data()[ATTR_QUESTION_STATS])["add_3_2"]
+        assert "question_id" not in stored
+        assert pm.get_question_stats()["add_3_2"].question_id == "add_3_2"
+
+    def test_update_question_stats_keeps_other_entries(self, handler_input, dynamodb_table):
+        """Updating changed stats leaves the other stored entries untouched."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.save_question_stats(
+            {
+                "add_3_2": QuestionStats(question_id="add_3_2", box=2),
+                "add_1_1": QuestionStats(question_id="add_1_1", box=5),
+            }
+        )
+
+        pm.update_question_stats({"add_3_2": QuestionStats(question_id="add_3_2", box=3)})
+
+        stats = pm.get_question_stats()
+        assert stats["add_3_2"].box == 3
+        assert stats["add_1_1"].box == 5
 
     def test_commit_not_called_if_no_changes(self, handler_input, dynamodb_table):
         """Commit without changes should not create an item."""
@@ -437,6 +477,16 @@ class TestUpdateSessionStats:
 
         assert stats["sessions_count"] == 2
 
+    def test_last_session_uses_one_timestamp_per_request(self, handler_input):
+        """All updates within one request should record the same last_session."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.increment_session_count()
+        first = pm.get_session_stats()["last_session"]
+        stats = pm.update_session_stats(questions_answered=1, correct_answers=1)
+
+        assert stats["last_session"] == first
+
     def test_session_stats_persist_to_dynamodb(self, handler_input, dynamodb_table):
         """Session stats should be persisted to DynamoDB."""
         pm = PersistenceManager(handler_input)
@@ -461,6 +511,10 @@ class TestHelperFunctions:
         pm = get_persistence_manager(handler_input)
         assert isinstance(pm, PersistenceManager)
 
+    def test_get_persistence_manager_is_shared_within_request(self, handler_input):
+        """Calls within one request should share one PersistenceManager."""
+        assert get_persistence_manager(handler_input) is get_persistence_manager(handler_input)
+
     def test_load_srs_data_new_user(self, handler_input):
         """Loading SRS data for new user returns empty stats and default grade."""
         question_stats, grade = load_srs_data(handler_input)
@@ -498,7 +552,7 @@ class TestHelperFunctions:
         item = response.get("Item", {})
 
         assert ATTR_QUESTION_STATS in item
-        assert "mul_6_7" in item[ATTR_QUESTION_STATS]
+        assert "mul_6_7" in json.loads(item[ATTR_QUESTION_STATS])
 
 
 class TestBackwardsCompatibility:
@@ -554,7 +608,7 @@ class TestConcurrentUpdates:
         response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
         item = response.get("Item", {})
 
-        saved_stats = item[ATTR_QUESTION_STATS]
+        saved_stats = json.loads(item[ATTR_QUESTION_STATS])
         assert len(saved_stats) == 3
         assert saved_stats["add_1_1"]["box"] == 2
         assert saved_stats["add_2_2"]["box"] == 3
@@ -578,5 +632,429 @@ class TestConcurrentUpdates:
         item = response.get("Item", {})
 
         assert item[ATTR_USER_PROFILE]["name"] == "Test"
-        assert "add_1_2" in item[ATTR_QUESTION_STATS]
+        assert "add_1_2" in json.loads(item[ATTR_QUESTION_STATS])
         assert item[ATTR_SESSION_STATS]["total_questions"] == 5
+
+
+class TestTransaction:
+    """Tests for grouping several updates into one write."""
+
+    def test_commit_deferred_until_transaction_exits(self, handler_input, dynamodb_table):
+        """commit() inside a transaction writes nothing until the block exits."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        with pm.transaction():
+            pm.save_question_stats({"add_1_1": QuestionStats(question_id="add_1_1", box=2)})
+            pm.commit()
+            pm.update_session_stats(questions_answered=1, correct_answers=1)
+
+            response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
+            assert "Item" not in response
+
+        response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
+        player_data = response["Item"]["players"]["emma"]
+        assert json.loads(player_data[ATTR_QUESTION_STATS])["add_1_1"]["box"] == 2
+        assert player_data[ATTR_SESSION_STATS]["total_questions"] == 1
+
+    def test_transaction_skips_write_on_error(self, handler_input, dynamodb_table):
+        """Pending changes are not written when the block raises."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        with pytest.raises(RuntimeError), pm.transaction():
+            pm.update_session_stats(questions_answered=1, correct_answers=1)
+            raise RuntimeError("handler failed")
+
+        response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
+        assert "Item" not in response
+
+
+class TestUnchangedCommit:
+    """Tests for skipping the write when the item did not actually change."""
+
+    def test_commit_skips_write_when_content_unchanged(self, handler_input, dynamodb_table):
+        """Re-saving data with identical content should not call PutItem."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+        manager = handler_input.attributes_manager
+        manager.save_persistent_attributes = MagicMock()
+
+        pm.save_session_stats(dict(pm.get_session_stats()))
+        pm.commit()
+
+        manager.save_persistent_attributes.assert_not_called()
+
+    def test_saving_unchanged_question_stats_does_not_mark_dirty(
+        self, handler_input, dynamodb_table
+    ):
+        """save_srs_data without any answers should not lead to a write."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.save_question_stats({"add_1_1": QuestionStats(question_id="add_1_1", box=2)})
+        pm.commit()
+
+        pm.save_question_stats(pm.get_question_stats())
+
+        assert not pm._dirty
+
+    def test_read_only_request_does_not_fingerprint_the_item(self, handler_input_with_data):
+        """The item is only serialized for comparison once something changes."""
+        pm = PersistenceManager(handler_input_with_data, player_name="Emma")
+
+        with patch("alexa.persistence._fingerprint") as fingerprint:
+            pm.get_user_profile()
+            pm.get_session_stats()
+            pm.commit()
+
+        fingerprint.assert_not_called()
+
+    def test_commit_writes_when_content_changed(self, handler_input_with_data):
+        """A real change is still written."""
+        pm = PersistenceManager(handler_input_with_data, player_name="Emma")
+        manager = handler_input_with_data.attributes_manager
+        manager.save_persistent_attributes = MagicMock()
+
+        pm.increment_session_count()
+        pm.commit()
+
+        manager.save_persistent_attributes.assert_called_once()
+
+
+class TestLoadPlayer:
+    """Tests for selecting a player and reading their summary in one pass."""
+
+    def test_load_new_player(self, handler_input, dynamodb_table):
+        """A player without a stored profile is reported as new."""
+        pm = PersistenceManager(handler_input)
+
+        player = pm.load_player("Emma")
+
+        assert player.is_new
+        assert pm.get_current_player() == "emma"
+
+    def test_load_returning_player(self, handler_input, dynamodb_table):
+        """A returning player's totals come from their stored session stats."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.save_user_profile(pm.get_user_profile())
+        pm.update_session_stats(questions_answered=10, correct_answers=7)
+        pm.commit()
+
+        player = PersistenceManager(handler_input).load_player("Emma")
+
+        assert not player.is_new
+        assert player.total_questions == 10
+        assert player.total_correct == 7
+
+
+class TestQuestionStatsEncoding:
+    """Tests for storing question stats as one JSON string."""
+
+    def test_legacy_map_with_decimals_is_reencoded(self, handler_input, dynamodb_table):
+        """Stats stored as a DynamoDB map (Decimal numbers) load and re-save as JSON."""
+        dynamodb_table.put_item(
+            Item={
+                PARTITION_KEY: "test-user-123",
+                "players": {
+                    "emma": {
+                        ATTR_QUESTION_STATS: {
+                            "add_1_1": {"correct_count": 3, "incorrect_count": 0, "box": 4}
+                        }
+                    }
+                },
+            }
+        )
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        assert pm.get_question_stats()["add_1_1"].box == 4
+
+        pm.update_question_stats({"add_2_2": QuestionStats(question_id="add_2_2", box=2)})
+        stored = json.loads(pm._get_player_data()[ATTR_QUESTION_STATS])
+        assert stored["add_1_1"]["box"] == 4
+        assert stored["add_2_2"]["box"] == 2
+
+
+class TestAttributesCache:
+    """Tests for reusing persistent attributes across warm invocations."""
+
+    @staticmethod
+    def _next_turn(dynamodb_table, previous: FakeHandlerInput) -> FakeHandlerInput:
+        """Next request of the same session (session attributes carried over)."""
+        handler_input = FakeHandlerInput(dynamodb_table, "test-user-123")
+        handler_input.attributes_manager.session_attributes = (
+            previous.attributes_manager.session_attributes
+        )
+        return handler_input
+
+    def test_second_request_skips_read(self, dynamodb_table):
+        """A later request of the same session is served from the warm cache."""
+        first = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(first, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+
+        second = self._next_turn(dynamodb_table, first)
+        pm = PersistenceManager(second, player_name="Emma")
+
+        assert pm.get_session_stats()["sessions_count"] == 1
+        assert second.attributes_manager._persistent_attributes is None
+
+    def test_cached_copy_is_not_shared(self, dynamodb_table):
+        """Changes that are not committed must not leak into the cache."""
+        first = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(first, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+        pm.increment_session_count()  # not committed
+
+        second = self._next_turn(dynamodb_table, first)
+        pm = PersistenceManager(second, player_name="Emma")
+
+        assert pm.get_session_stats()["sessions_count"] == 1
+
+    def test_commit_bumps_version(self, handler_input, dynamodb_table):
+        """Every write stores a new item version and records it in session."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+        pm.increment_session_count()
+        pm.commit()
+
+        item = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})["Item"]
+        assert item[ATTR_VERSION] == 2
+        assert handler_input.attributes_manager.session_attributes[SESSION_ATTRIBUTES_VERSION] == 2
+
+    def test_new_session_reads_the_item(self, dynamodb_table):
+        """A session that has not read the item yet does not trust the warm cache."""
+        first = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(first, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+
+        other_session = FakeHandlerInput(dynamodb_table, "test-user-123")
+        PersistenceManager(other_session, player_name="Emma").get_session_stats()
+
+        assert other_session.attributes_manager._persistent_attributes is not None
+
+    def test_stale_entry_from_another_container_is_not_served(self, dynamodb_table):
+        """Turns served by containers A, B, A: A must not write back its outdated item."""
+        first = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(first, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+        container_a = dict(_ATTRIBUTES_CACHE)
+
+        # Turn on container B, whose cache does not have the item yet
+        _ATTRIBUTES_CACHE.clear()
+        second = self._next_turn(dynamodb_table, first)
+        pm = PersistenceManager(second, player_name="Emma")
+        pm.update_session_stats(questions_answered=1, correct_answers=1)
+        pm.commit()
+
+        # Back on container A, whose cached item predates B's write
+        _ATTRIBUTES_CACHE.clear()
+        _ATTRIBUTES_CACHE.update(container_a)
+        third = self._next_turn(dynamodb_table, second)
+        pm = PersistenceManager(third, player_name="Emma")
+        assert pm.get_session_stats()["total_questions"] == 1
+        pm.increment_session_count()
+        pm.commit()
+
+        item = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})["Item"]
+        stats = item["players"]["emma"][ATTR_SESSION_STATS]
+        assert stats["total_questions"] == 1
+        assert stats["sessions_count"] == 2
+
+    def test_write_does_not_drop_another_sessions_player(self, dynamodb_table):
+        """Max on device A and Anna on device B: Max's write must keep Anna's data."""
+        # Max starts on device A; the turn is served by container X
+        max_turn = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(max_turn, player_name="Max")
+        pm.save_user_profile(pm.get_user_profile())
+        pm.commit()
+        container_x = dict(_ATTRIBUTES_CACHE)
+
+        # Anna plays on device B, served by container Y
+        _ATTRIBUTES_CACHE.clear()
+        anna_turn = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(anna_turn, player_name="Anna")
+        pm.save_user_profile(pm.get_user_profile())
+        pm.update_session_stats(questions_answered=10, correct_answers=9)
+        pm.commit()
+
+        # Max's next turn goes back to container X, whose cached item predates
+        # Anna's write but still has the version Max's session last wrote
+        _ATTRIBUTES_CACHE.clear()
+        _ATTRIBUTES_CACHE.update(container_x)
+        next_max_turn = self._next_turn(dynamodb_table, max_turn)
+        pm = PersistenceManager(next_max_turn, player_name="Max")
+        assert pm.get_known_players() == ["max"]  # read-only lookups use the cache
+        pm.update_session_stats(questions_answered=10, correct_answers=7)
+        pm.commit()
+
+        item = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})["Item"]
+        assert sorted(item["players"]) == ["anna", "max"]
+        assert item["players"]["anna"][ATTR_SESSION_STATS]["total_correct"] == 9
+        assert item["players"]["max"][ATTR_SESSION_STATS]["total_correct"] == 7
+
+    def test_flushed_answers_keep_answers_from_another_device(self, dynamodb_table):
+        """The same player answering on two devices: both devices' answers are counted."""
+        device_a = FakeHandlerInput(dynamodb_table, "test-user-123")
+        device_a.attributes_manager.session_attributes["current_player"] = "emma"
+        device_a.attributes_manager.session_attributes["pending_answers"] = [["add_1_1", 1, 1.0]]
+        flush_pending_answers(device_a)
+        container_x = dict(_ATTRIBUTES_CACHE)
+
+        # Device B, served by container Y
+        _ATTRIBUTES_CACHE.clear()
+        device_b = FakeHandlerInput(dynamodb_table, "test-user-123")
+        device_b.attributes_manager.session_attributes["current_player"] = "emma"
+        device_b.attributes_manager.session_attributes["pending_answers"] = [["add_1_1", 1, 2.0]]
+        flush_pending_answers(device_b)
+
+        # Device A again, back on container X with its outdated cached item
+        _ATTRIBUTES_CACHE.clear()
+        _ATTRIBUTES_CACHE.update(container_x)
+        next_turn = self._next_turn(dynamodb_table, device_a)
+        next_turn.attributes_manager.session_attributes["pending_answers"] = [["add_1_1", 0, 3.0]]
+        flush_pending_answers(next_turn)
+
+        stats = PersistenceManager(
+            FakeHandlerInput(dynamodb_table, "test-user-123"), player_name="Emma"
+        ).get_question_stats()
+        assert stats["add_1_1"].correct_count == 2
+        assert stats["add_1_1"].incorrect_count == 1
+
+    def test_read_only_request_uses_cache_but_write_reads_the_item(self, dynamodb_table):
+        """Reads are served from the cache; the first change reads DynamoDB."""
+        first = FakeHandlerInput(dynamodb_table, "test-user-123")
+        pm = PersistenceManager(first, player_name="Emma")
+        pm.increment_session_count()
+        pm.commit()
+
+        second = self._next_turn(dynamodb_table, first)
+        pm = PersistenceManager(second, player_name="Emma")
+        pm.get_session_stats()
+        assert second.attributes_manager._persistent_attributes is None
+
+        pm.increment_session_count()
+        assert second.attributes_manager._persistent_attributes is not None
+
+
+class TestLazyQuestionStats:
+    """Tests for question stats parsed on first access."""
+
+    def test_entries_parse_on_access(self):
+        """Only entries that are read become QuestionStats objects."""
+        stats = LazyQuestionStats({"add_1_1": {"box": 3}, "add_2_2": {"box": 1}})
+
+        assert stats["add_1_1"].box == 3
+        assert stats["add_1_1"].question_id == "add_1_1"
+        assert list(stats._parsed) == ["add_1_1"]
+        assert len(stats) == 2
+
+    def test_serialized_passes_unread_entries_through(self):
+        """Unread entries are written back in their stored form."""
+        stored_entry = {"box": 1, "correct_count": 0, "incorrect_count": 0, "last_asked": None}
+        stats = LazyQuestionStats({"add_2_2": stored_entry})
+        stats["add_1_1"] = QuestionStats(question_id="add_1_1", box=2)
+
+        data = stats.serialized()
+
+        assert data["add_2_2"] is stored_entry
+        assert data["add_1_1"]["box"] == 2
+
+    def test_copy_module_keeps_parsed_entries_separate(self):
+        """copy.copy gives a new map, so entries added to it do not show up in the original."""
+        stats = LazyQuestionStats({"add_1_1": {"box": 3}})
+        stats["add_1_1"]  # parse
+        clone = copy.copy(stats)
+
+        clone["add_2_2"] = QuestionStats(question_id="add_2_2")
+
+        assert isinstance(clone, LazyQuestionStats)
+        assert "add_2_2" not in stats
+        assert clone["add_1_1"] is stats["add_1_1"]
+
+
+class TestPlayerData:
+    """Tests for the memoized reference to the current player's stored data."""
+
+    def test_reading_unknown_player_does_not_register_them(self, handler_input, dynamodb_table):
+        """Reads for a player without data must not add them to the account."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.get_session_stats()
+
+        assert pm.get_known_players() == []
+
+    def test_updates_apply_to_the_stored_player_dict(self, handler_input, dynamodb_table):
+        """Saved player data is reachable through the persistent attributes."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.increment_session_count()
+        pm.increment_session_count()
+
+        stored = pm._load_persistent_attributes()["players"]["emma"]
+        assert stored[ATTR_SESSION_STATS]["sessions_count"] == 2
+
+
+class TestUpdateUserProfile:
+    """Tests for setting individual profile fields."""
+
+    def test_update_existing_profile_in_place(self, handler_input, dynamodb_table):
+        """Only the given field changes; the rest of the stored profile is kept."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        profile = pm.get_user_profile()
+        profile.best_streak = 7
+        pm.save_user_profile(profile)
+        pm.commit()
+
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.update_user_profile(grade=3)
+        pm.commit()
+
+        response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
+        stored = response["Item"]["players"]["emma"][ATTR_USER_PROFILE]
+        assert stored["grade"] == 3
+        assert stored["best_streak"] == 7
+        assert pm.get_user_profile().grade == 3
+
+    def test_update_creates_profile_for_new_player(self, handler_input, dynamodb_table):
+        """A new player gets a full profile with the given field set."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+        pm.update_user_profile(grade=2)
+        pm.commit()
+
+        assert not pm.is_new_player()
+        assert pm.get_user_profile().grade == 2
+
+
+class TestNoPersistedDataMarker:
+    """Tests for skipping the read for accounts known to have no stored item."""
+
+    def test_empty_read_marks_session(self, handler_input, dynamodb_table):
+        """Finding no stored item sets the session marker."""
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.get_session_stats()
+
+        assert handler_input.attributes_manager.session_attributes[SESSION_NO_PERSISTED_DATA]
+
+    def test_marker_skips_read(self, handler_input, dynamodb_table):
+        """With the marker set, no DynamoDB read is made."""
+        handler_input.attributes_manager.session_attributes[SESSION_NO_PERSISTED_DATA] = True
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        assert pm.is_new_player()
+        assert handler_input.attributes_manager._persistent_attributes is None
+
+    def test_commit_clears_marker(self, handler_input, dynamodb_table):
+        """Once data is written the marker is removed."""
+        handler_input.attributes_manager.session_attributes[SESSION_NO_PERSISTED_DATA] = True
+        pm = PersistenceManager(handler_input, player_name="Emma")
+
+        pm.increment_session_count()
+        pm.commit()
+
+        assert SESSION_NO_PERSISTED_DATA not in handler_input.attributes_manager.session_attributes
+        response = dynamodb_table.get_item(Key={PARTITION_KEY: "test-user-123"})
+        assert "players" in response["Item"]
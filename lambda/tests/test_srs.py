@@ -2,11 +2,14 @@
 Unit tests for the Spaced Repetition System (SRS).
 """
 
-from datetime import datetime
+import time
 from unittest.mock import patch
 
+import pytest
+
 from alexa.math_questions import MathQuestion, Operation
 from alexa.models import QuestionStats
+from alexa.persistence import LazyQuestionStats
 from alexa.srs import MAX_BOX, MIN_BOX, SpacedRepetition
 
 
@@ -51,7 +54,7 @@ class TestQuestionStats:
 
     def test_to_dict_and_from_dict(self):
         """Should round-trip through dict serialization."""
-        now = datetime.now()
+        now = time.time()
         original = QuestionStats(
             question_id="mul_6_8",
             correct_count=10,
@@ -67,8 +70,8 @@ class TestQuestionStats:
         assert restored.correct_count == original.correct_count
         assert restored.incorrect_count == original.incorrect_count
         assert restored.box == original.box
-        # Datetime comparison with some tolerance
-        assert abs((restored.last_asked - original.last_asked).total_seconds()) < 1
+        # Stored with whole-second precision
+        assert abs(restored.last_asked - original.last_asked) < 1
 
 
 class TestSpacedRepetition:
@@ -127,6 +130,19 @@ class TestSpacedRepetition:
         assert stats.box == MIN_BOX
         assert stats.incorrect_count == 1
 
+    def test_pop_changed_stats_returns_answered_questions_once(self):
+        """Only questions answered since the last pop are reported as changed."""
+        initial_stats = {
+            "add_5_3": QuestionStats(question_id="add_5_3", box=2),
+            "add_2_2": QuestionStats(question_id="add_2_2", box=3),
+        }
+        srs = SpacedRepetition(question_stats=initial_stats, grade=1)
+
+        srs.record_answer("add_5_3", correct=True)
+
+        assert list(srs.pop_changed_stats()) == ["add_5_3"]
+        assert srs.pop_changed_stats() == {}
+
     def test_record_answer_max_box_limit(self):
         """Box should not exceed MAX_BOX."""
         initial_stats = {
@@ -141,14 +157,43 @@ class TestSpacedRepetition:
     def test_record_answer_updates_last_asked(self):
         """Recording answer should update last_asked timestamp."""
         srs = SpacedRepetition(grade=1)
-        before = datetime.now()
+        before = time.time()
 
         srs.record_answer("add_5_3", correct=True)
 
-        after = datetime.now()
+        after = time.time()
         last_asked = srs.question_stats["add_5_3"].last_asked
         assert before <= last_asked <= after
 
+    def test_record_answer_uses_given_answer_time(self):
+        """An answer recorded later keeps the time it was given as last_asked."""
+        srs = SpacedRepetition(grade=1)
+
+        srs.record_answer("add_5_3", correct=True, answered_at=1700000000.0)
+
+        assert srs.question_stats["add_5_3"].last_asked == 1700000000.0
+
+    def test_question_stats_is_read_only_view(self):
+        """question_stats should reflect later answers but not allow writes."""
+        srs = SpacedRepetition(grade=1)
+        view = srs.question_stats
+
+        srs.record_answer("add_5_3", correct=True)
+
+        assert "add_5_3" in view
+        with pytest.raises(TypeError):
+            view["add_1_1"] = QuestionStats(question_id="add_1_1")
+
+    def test_answers_in_one_request_share_timestamp(self):
+        """One SRS instance should read the clock once for all answers."""
+        srs = SpacedRepetition(grade=1)
+
+        srs.record_answer("add_5_3", correct=True)
+        srs.record_answer("add_2_2", correct=False)
+
+        stats = srs.question_stats
+        assert stats["add_5_3"].last_asked == stats["add_2_2"].last_asked
+
     def test_no_immediate_repeat(self):
         """Should not repeat the same question immediately."""
         srs = SpacedRepetition(grade=1)
@@ -166,6 +211,48 @@ class TestSpacedRepetition:
             # (within recent window of 5)
             pass  # The SRS has a 5-question buffer
 
+    def test_recent_window_evicts_oldest(self):
+        """Only the last five answered questions should count as recent."""
+        srs = SpacedRepetition(grade=1)
+
+        for i in range(1, 7):
+            srs.record_answer(f"add_{i}_1", correct=True)
+
+        assert list(srs._recent_questions) == [f"add_{i}_1" for i in range(2, 7)]
+        assert srs._recent_set == {f"add_{i}_1" for i in range(2, 7)}
+
+    def test_recent_window_keeps_repeated_question(self):
+        """Evicting an older copy should keep a question that is still recent."""
+        srs = SpacedRepetition(grade=1)
+
+        for question_id in ["add_1_1", "add_2_1", "add_3_1", "add_4_1", "add_1_1", "add_5_1"]:
+            srs.record_answer(question_id, correct=True)
+
+        assert "add_1_1" in srs._recent_set
+
+    def test_get_next_question_honors_exclude(self):
+        """Should not return questions the caller excluded."""
+        stats = {
+            "add_1_1": QuestionStats(question_id="add_1_1", box=1),
+            "add_2_2": QuestionStats(question_id="add_2_2", box=1),
+        }
+        srs = SpacedRepetition(question_stats=stats, grade=1)
+
+        for _ in range(20):
+            q = srs.get_next_question(exclude={"add_1_1"})
+            assert q.question_id != "add_1_1"
+
+    def test_get_next_questions_returns_distinct_questions(self):
+        """Should plan the requested number of distinct questions."""
+        srs = SpacedRepetition(grade=2)
+
+        questions = srs.get_next_questions(10, exclude={"add_1_1"})
+
+        ids = [q.question_id for q in questions]
+        assert len(ids) == 10
+        assert len(set(ids)) == 10
+        assert "add_1_1" not in ids
+
     def test_get_weak_areas_identifies_struggles(self):
         """Should identify operations with low accuracy."""
         stats = {
@@ -195,6 +282,24 @@ class TestSpacedRepetition:
 
         assert "Plus-Aufgaben" in strong_areas
 
+    def test_areas_follow_answers_recorded_after_first_report(self):
+        """Operation totals kept up to date should match a fresh computation."""
+        srs = SpacedRepetition(grade=1)
+        assert srs.get_weak_areas() == []
+
+        for _ in range(3):
+            srs.record_answer("sub_5_3", correct=False)
+        srs.record_answer("add_1_1", correct=True)
+        srs.record_answer("add_1_1", correct=True)
+
+        # add_1_1 has too few attempts to count towards the strong areas yet
+        assert srs.get_strong_areas() == []
+        srs.record_answer("add_1_1", correct=True)
+
+        fresh = SpacedRepetition(question_stats=srs.copy_stats(), grade=1)
+        assert srs.get_weak_areas() == fresh.get_weak_areas() == ["Subtraktion"]
+        assert srs.get_strong_areas() == fresh.get_strong_areas() == ["Plus-Aufgaben"]
+
     def test_export_and_load_stats(self):
         """Should export and reload stats correctly."""
         srs = SpacedRepetition(grade=2)
@@ -269,6 +374,13 @@ class TestSpacedRepetition:
         assert srs._reconstruct_question("invalid") is None
         assert srs._reconstruct_question("add_x_5") is None
         assert srs._reconstruct_question("unknown_5_3") is None
+        assert srs._reconstruct_question("add_7_5_1") is None
+
+    def test_reconstructed_questions_are_shared(self):
+        """Reconstructing the same ID twice should reuse the cached question."""
+        srs = SpacedRepetition(grade=1)
+
+        assert srs._reconstruct_question("add_7_5") is srs._reconstruct_question("add_7_5")
 
     def test_reset_session(self):
         """Should clear session tracking."""
@@ -309,7 +421,9 @@ class TestSpacedRepetition:
                     total_srs_selections += 1
                     if q.question_id == "add_1_1":
                         box1_count += 1
-                srs._recent_questions.clear()  # Allow repeats for this test
+                # Allow repeats for this test
+                srs._recent_questions.clear()
+                srs._recent_set.clear()
 
         # Box 1 question should be selected more often than average
         if total_srs_selections > 0:
@@ -318,6 +432,22 @@ class TestSpacedRepetition:
             # (it has weight 1.0, box 5 has weight 0.0625)
             assert box1_ratio > 0.3  # Should be selected >30% of time
 
+    def test_selection_parses_only_remaining_entries(self):
+        """Stored entries filtered out by ID are never parsed."""
+        stats = LazyQuestionStats(
+            {
+                "add_1_1": {"correct_count": 0, "incorrect_count": 1, "box": 1},
+                "add_2_2": {"correct_count": 0, "incorrect_count": 1, "box": 1},
+            }
+        )
+        srs = SpacedRepetition(question_stats=stats, grade=1)
+
+        question = srs._select_from_srs(exclude={"add_1_1"})
+
+        assert question is not None
+        assert question.question_id == "add_2_2"
+        assert "add_1_1" not in stats._parsed
+
 
 class TestSRSIntegration:
     """Integration tests for the SRS with the math engine."""
@@ -0,0 +1,86 @@
+#!/bin/bash
+#
+# Schedule a keep-warm ping for the Math Quiz Lambda function
+#
+# Creates an EventBridge rule that invokes the function every few minutes so
+# a warm container (with modules imported and the DynamoDB client connected)
+# is usually available when a child starts the skill. The function answers
+# these scheduled events immediately without running the skill.
+#
+# Usage: ./enable-keep-warm.sh [--region REGION] [--rate RATE]
+#
+# Environment variables:
+#   AWS_REGION - AWS region (default: eu-west-1)
+#
+
+set -e
+
+# Configuration
+AWS_PROFILE="${AWS_PROFILE:-math-quiz-dev}"
+REGION="${AWS_REGION:-eu-west-1}"
+FUNCTION_NAME="alexa-skill-math"
+RULE_NAME="$FUNCTION_NAME-keep-warm"
+RATE="5 minutes"
+
+export AWS_PROFILE
+
+# Parse arguments
+while [[ $# -gt 0 ]]; do
+    case $1 in
+        --region)
+            REGION="$2"
+            shift 2
+            ;;
+        --rate)
+            RATE="$2"
+            shift 2
+            ;;
+        -h|--help)
+            echo "Usage: $0 [--region REGION] [--rate RATE]"
+            echo ""
+            echo "Options:"
+            echo "  --region  AWS region (default: eu-west-1)"
+            echo "  --rate    Ping interval, e.g. '5 minutes' (default: 5 minutes)"
+            exit 0
+            ;;
+        *)
+            echo "Unknown option: $1"
+            exit 1
+            ;;
+    esac
+done
+
+echo "Scheduling keep-warm ping..."
+echo "  Region:   $REGION"
+echo "  Function: $FUNCTION_NAME"
+echo "  Rate:     $RATE"
+echo ""
+
+FUNCTION_ARN=$(aws lambda get-function \
+    --function-name "$FUNCTION_NAME" \
+    --region "$REGION" \
+    --query 'Configuration.FunctionArn' \
+    --output text)
+
+RULE_ARN=$(aws events put-rule \
+    --name "$RULE_NAME" \
+    --schedule-expression "rate($RATE)" \
+    --region "$REGION" \
+    --query 'RuleArn' \
+    --output text)
+
+# Allow EventBridge to invoke the function (ignore if already granted)
+aws lambda add-permission \
+    --function-name "$FUNCTION_NAME" \
+    --statement-id "$RULE_NAME" \
+    --action lambda:InvokeFunction \
+    --principal events.amazonaws.com \
+    --source-arn "$RULE_ARN" \
+    --region "$REGION" &>/dev/null || true
+
+aws events put-targets \
+    --rule "$RULE_NAME" \
+    --targets "Id=1,Arn=$FUNCTION_ARN" \
+    --region "$REGION" >/dev/null
+
+echo "✅ Keep-warm rule '$RULE_NAME' is active!"